@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the ast tree wrappers. It measures construction
+#               of the ast trees of all corpus functions and the evaluation
+#               of them in the silent build with warm ast cache.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+
+from callgraph.ast_tree import ASTTree
+from callgraph.builder import CallGraphBuilder
+from callgraph.cache import module_cache
+from benchmarks import corpus
+from benchmarks.corpus import main
+
+def construct(module):
+    for lineno, def_tree in module.index.items():
+        ASTTree(def_tree, module.block_lines(def_tree, lineno), lineno)
+
+def evaluate():
+    CallGraphBuilder(silent=True).build(main)
+
+if __name__ == "__main__":
+    module = module_cache.fetch(corpus.__file__)
+    evaluate()
+    number = 200
+    built = min(repeat(lambda: construct(module), number=number, repeat=5))
+    evaluated = min(repeat(evaluate, number=number, repeat=5))
+    print("construction of {0} trees: {1:.1f}us"
+          .format(len(module.index), built / number * 1e6))
+    print("evaluation of silent build: {0:.1f}us"
+          .format(evaluated / number * 1e6))
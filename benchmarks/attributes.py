@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the attribute lookup. It compares static_attr
+#               with the lookups cached per class and name against hasattr()
+#               and getattr() (what UnarySymbol.get did before) on the
+#               objects of a build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+
+from callgraph.utils import static_attr
+from benchmarks.make_code import build_objects
+
+def dynamic_attr(obj, name):
+    if hasattr(obj, name): return True, getattr(obj, name)
+    return False, None
+
+def collect_lookups():
+    names = ("strip", "lower", "__init__", "__name__", "render", "missing")
+    return [(obj, name) for obj in build_objects() for name in names]
+
+def measure(lookup, lookups, number=200):
+    def run():
+        for obj, name in lookups: lookup(obj, name)
+    best = min(repeat(run, number=number, repeat=5))
+    return best / number / len(lookups)
+
+if __name__ == "__main__":
+    lookups = collect_lookups()
+    dynamic = measure(dynamic_attr, lookups)
+    static = measure(static_attr, lookups)
+    print("lookups: {0}".format(len(lookups)))
+    print("hasattr() and getattr(): {0:.2f}us/lookup".format(dynamic * 1e6))
+    print("static_attr with cache:  {0:.2f}us/lookup".format(static * 1e6))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the argument binding. It compares the cached
+#               binding plans against inspect.signature() and bind_partial()
+#               with fresh symbols of defaults on each call (what the builder
+#               did before) on the calls of a build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+from inspect import signature
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.symbols import UnarySymbol
+from benchmarks.corpus import main
+
+def bind_signature(builder, function, args, kwargs, myself):
+    sig = signature(function)
+    args, kwargs = list(args), dict(kwargs)
+    if myself and sig.parameters:
+        if next(iter(sig.parameters.keys())) == "self":
+            args.insert(0, myself)
+        else: kwargs["self"] = myself
+    if not any(p.kind == p.VAR_KEYWORD for p in sig.parameters.values()):
+        kwargs = dict((p.name, kwargs[p.name])
+                      for p in sig.parameters.values()
+                      if p.kind == p.POSITIONAL_OR_KEYWORD
+                      and p.name in kwargs)
+    bound = sig.bind_partial(*args, **kwargs)
+    for param in sig.parameters.values():
+        if param.name not in bound.arguments:
+            if param.default is not param.empty:
+                symbol = UnarySymbol(builder, param.name, param.default)
+                bound.arguments[param.name] = symbol
+    return bound.arguments
+
+def bind_plan(builder, function, args, kwargs, myself):
+    return builder.binding_plan(function).bind(args, kwargs, myself)
+
+def record_calls():
+    builder = CallGraphBuilder(silent=True)
+    calls, inject_arguments = [], builder.inject_arguments
+    def record(printer, node, args, kwargs):
+        calls.append((node.symbol.value, list(args), dict(kwargs),
+                      node.symbol.myself))
+        return inject_arguments(printer, node, args, kwargs)
+    builder.inject_arguments = record
+    builder.build(main)
+    return builder, calls
+
+def measure(bind, builder, calls, number=200):
+    def run():
+        for function, args, kwargs, myself in calls:
+            bind(builder, function, args, kwargs, myself)
+    best = min(repeat(run, number=number, repeat=5))
+    return best / number / len(calls)
+
+if __name__ == "__main__":
+    builder, calls = record_calls()
+    probes = measure(bind_signature, builder, calls)
+    planned = measure(bind_plan, builder, calls)
+    print("calls: {0}".format(len(calls)))
+    print("binding with signature(): {0:.2f}us/call".format(probes * 1e6))
+    print("binding with plans:       {0:.2f}us/call".format(planned * 1e6))
+    print("speedup: {0:.1f}x".format(probes / planned))
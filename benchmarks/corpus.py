@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Code analysed by the benchmarks.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+def normalize(text):
+    return text.strip().lower()
+
+def tokenize(text):
+    text = normalize(text)
+    return text.split()
+
+def join_tokens(tokens):
+    return " ".join(tokens)
+
+class Token(object):
+    def __init__(self, text):
+        self.text = normalize(text)
+        self.kind = classify(self.text)
+
+    def render(self):
+        return join_tokens([self.text, self.kind])
+
+def classify(text):
+    if text.isdigit():
+        return "number"
+    if text.isalpha():
+        return "word"
+    return normalize("other")
+
+class Document(object):
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+
+    def words(self):
+        for token in self.tokens:
+            yield Token(token)
+
+    def render(self):
+        result = ""
+        for word in self.words():
+            result = join_tokens([result, word.render()])
+        return result.strip()
+
+def summarize(text):
+    document = Document(text)
+    rendered = document.render()
+    first = Token(rendered)
+    return first.render().upper()
+
+def report(texts):
+    lines = []
+    for text in texts:
+        summary = summarize(text)
+        lines.append(summary.center(80))
+        lines.append(normalize(summary))
+    return join_tokens(lines).splitlines()
+
+def main(texts):
+    for line in report(texts):
+        line.rstrip()
+    summarize(join_tokens(texts)).encode("utf-8")
+    Document(normalize("")).render().title()
+
+def pick_token(text):
+    token = Token(text)
+    if text.startswith("a"): return token
+    if text.startswith("b"): return token
+    if text.startswith("c"): return token
+    if text.startswith("d"): return token
+    if text.startswith("e"): return token
+    if text.startswith("f"): return token
+    if text.startswith("g"): return token
+    if text.startswith("h"): return token
+    return token
+
+def render_picked(texts):
+    result = []
+    for text in texts:
+        first = pick_token(text)
+        second = pick_token(first.render())
+        third = pick_token(second.render())
+        fourth = pick_token(third.render())
+        fifth = pick_token(fourth.render())
+        for other in (first, second, third, fourth, fifth):
+            result.append(other.render())
+    return result
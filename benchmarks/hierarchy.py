@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the super() resolution. It compares the super
+#               symbols made from the class hierarchy index against walking
+#               getmro() and making the base class symbols on each super()
+#               use (what SuperBuiltinSymbol did before).
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+from inspect import getmro
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.symbols import UnarySymbol, SuperBuiltinSymbol
+
+class Base(object):
+    def method(self):
+        pass
+
+class Left(Base):
+    def method(self):
+        super().method()
+
+class Right(Base):
+    def method(self):
+        super().method()
+
+class Leaf(Left, Right):
+    def method(self):
+        super().method()
+
+def make_super_getmro(self, parent):
+    __super__ = UnarySymbol(parent.builder, "__super__", super.__init__)
+    for cls in getmro(parent.myself.value)[1:-1]:
+        symbol = UnarySymbol(parent.builder, cls.__name__, cls)
+        symbol.force_myself = parent.myself
+        __super__.can_return(symbol)
+    return [__super__]
+
+def make_parents(builder):
+    instance = UnarySymbol(builder, "Leaf", Leaf).make_instance()
+    parents = []
+    for cls in (Leaf, Left, Right):
+        parent = UnarySymbol(builder, "method", cls.method)
+        parent.myself = instance
+        parents.append(parent)
+    return parents
+
+def measure(make_super, number=2000):
+    builder = CallGraphBuilder(silent=True)
+    parents = make_parents(builder)
+    def resolve():
+        for parent in parents: SuperBuiltinSymbol(parent)
+    SuperBuiltinSymbol.make_super = make_super
+    best = min(repeat(resolve, number=number, repeat=5))
+    return best / number / len(parents)
+
+if __name__ == "__main__":
+    make_super = SuperBuiltinSymbol.make_super
+    try:
+        probes = measure(make_super_getmro)
+    finally: SuperBuiltinSymbol.make_super = make_super
+    indexed = measure(make_super)
+    print("super() with getmro():     {0:.2f}us".format(probes * 1e6))
+    print("super() with class index:  {0:.2f}us".format(indexed * 1e6))
+    print("speedup: {0:.1f}x".format(probes / indexed))
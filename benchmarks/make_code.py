@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the code classification. It compares make_code
+#               with the cached attribute names against the dir() probes
+#               (what make_code did before) on the objects of a build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import ast
+from timeit import repeat
+from inspect import isbuiltin
+
+from callgraph import code
+from callgraph.builder import CallGraphBuilder
+from benchmarks.corpus import main
+
+def make_code_dir(obj):
+    if "__code__" in dir(obj):
+        return code.TransparentCode(obj)
+    if "__self__" in dir(obj):
+        if "__func__" in dir(obj):
+            return code.TransparentCode(obj.__func__)
+        if "__class__" in dir(obj.__self__):
+            return code.OpaqueMethodCode(obj)
+    if "__objclass__" in dir(obj):
+        return code.OpaqueSlotCode(obj)
+    if isbuiltin(obj): return code.OpaqueFunctionCode(obj)
+    if isinstance(obj, ast.AST): return code.LambdaCode(obj)
+    if "__call__" in dir(obj): return code.OpaqueFunctionCode(obj.__call__)
+    return code.InvalidCode(obj)
+
+def build_objects():
+    objects, stack = [], [CallGraphBuilder(silent=True).build(main)]
+    while stack:
+        node = stack.pop()
+        if not node.invalid: objects.append(node.symbol.value)
+        stack.extend(node.children)
+    return objects
+
+def measure(make_code, objects, number=200):
+    def classify():
+        for obj in objects: make_code(obj)
+    best = min(repeat(classify, number=number, repeat=5))
+    return best / number / len(objects)
+
+if __name__ == "__main__":
+    objects = build_objects()
+    probes = measure(make_code_dir, objects)
+    cached = measure(code.make_code, objects)
+    print("nodes: {0}".format(len(objects)))
+    print("make_code with dir() probes:  {0:.2f}us/node".format(probes * 1e6))
+    print("make_code with cached names:  {0:.2f}us/node".format(cached * 1e6))
+    print("speedup: {0:.1f}x".format(probes / cached))
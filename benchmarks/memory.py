@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the memory taken by nodes and symbols. It
+#               reports the bytes allocated per node, per symbol and by the
+#               silent build of the corpus.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import tracemalloc
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.symbols import UnarySymbol, MultiSymbol
+from callgraph.nodes import make_node
+from benchmarks.corpus import main, normalize
+
+def allocated(make, number=10000):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [make() for _ in range(number)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return size / number
+
+def build_peak():
+    builder = CallGraphBuilder(silent=True)
+    builder.build(main)
+    tracemalloc.start()
+    root = builder.build(main)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+if __name__ == "__main__":
+    builder = CallGraphBuilder(silent=True)
+    keys = builder.node_keys
+    symbol = UnarySymbol(builder, "normalize", normalize)
+    make_node(symbol, keys).ast
+    opaque = lambda: UnarySymbol(builder, "len", len)
+    sizes = [("node", allocated(lambda: make_node(symbol, keys))),
+             ("opaque node", allocated(lambda: make_node(opaque(), keys))
+                             - allocated(opaque)),
+             ("symbol", allocated(lambda: UnarySymbol(builder, "a", 1))),
+             ("multi symbol",
+              allocated(lambda: MultiSymbol(builder, "a", [symbol])))]
+    for name, size in sizes:
+        print("bytes per {0}: {1:.0f}".format(name, size))
+    print("peak bytes of build: {0}".format(build_peak()))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the name resolution. It compares find_object
+#               with the per function name tables against getclosurevars()
+#               probes (what find_object did before) on the names of corpus
+#               functions and of one closure that uses many names. Then it
+#               measures the lookups through the per build name index that
+#               resolves the names in batch on function entry.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+from inspect import getclosurevars
+
+from callgraph import finder
+from benchmarks import corpus
+
+def make_closure():
+    a, b, c, d = corpus.normalize, corpus.tokenize, corpus.classify, len
+    def closure(texts):
+        for text in texts:
+            x = a(text) + str(b(text)) + c(text) + repr(d(text))
+            y = corpus.join_tokens(sorted(set(x))) + corpus.summarize(text)
+            print(min(x), max(y), abs(hash(x)), isinstance(y, str))
+    return closure
+
+def scan_closure_probes(function, name):
+    closure_vars = getclosurevars(function)
+    return closure_vars.nonlocals.get(name,
+               closure_vars.globals.get(name,
+                   closure_vars.builtins.get(name, None)))
+
+def collect_names():
+    functions = [corpus.normalize, corpus.tokenize, corpus.classify,
+                 corpus.summarize, corpus.report, corpus.main,
+                 corpus.Token.__init__, corpus.Document.__init__,
+                 make_closure()]
+    return [(function, name) for function in functions
+            for name in function.__code__.co_names
+                        + function.__code__.co_freevars]
+
+def measure(names, number=200):
+    def resolve():
+        for function, name in names: finder.find_object(function, name)
+    best = min(repeat(resolve, number=number, repeat=5))
+    return number * len(names) / best
+
+def measure_index(names, number=200):
+    def resolve():
+        for function, name in names:
+            if index.find(function, name) is None:
+                finder.find_object(function, name)
+    index = finder.NameIndex()
+    best = min(repeat(resolve, number=number, repeat=5))
+    return number * len(names) / best
+
+if __name__ == "__main__":
+    names = collect_names()
+    cached = measure(names)
+    scan_closure = finder.scan_closure
+    finder.scan_closure = scan_closure_probes
+    try:
+        probes = measure(names)
+    finally: finder.scan_closure = scan_closure
+    print("names: {0}".format(len(names)))
+    print("find_object with getclosurevars: {0:.0f} lookups/s".format(probes))
+    print("find_object with name tables:    {0:.0f} lookups/s".format(cached))
+    print("speedup: {0:.1f}x".format(cached / probes))
+
+    indexed = measure_index(names)
+    print("find through name index:         {0:.0f} lookups/s".format(indexed))
+    print("speedup: {0:.1f}x".format(indexed / cached))
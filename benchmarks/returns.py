@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the function that returns from many branches
+#               and is called in loop. It counts the values of the result
+#               symbols and measures the silent build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+
+from callgraph.builder import CallGraphBuilder
+from benchmarks.corpus import render_picked
+
+def count_nodes(root):
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
+def build():
+    return CallGraphBuilder(silent=True).build(render_picked)
+
+if __name__ == "__main__":
+    root = build()
+    number = 20
+    elapsed = min(repeat(build, number=number, repeat=5))
+    print("nodes of callgraph: {0}".format(count_nodes(root)))
+    builder = CallGraphBuilder(silent=True)
+    root = builder.build(render_picked)
+    symbol = root.symbol.get("pick_token")
+    print("values returned by pick_token: {0}"
+          .format(len(list(symbol.returns()))))
+    print("silent build: {0:.2f}ms".format(elapsed / number * 1e3))
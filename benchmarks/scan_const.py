@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the lookup of local functions and classes. It
+#               compares scan_const that caches the objects made from nested
+#               code against reading the source and evaluating the class
+#               body with copied globals (what scan_const did before).
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import re
+from timeit import repeat
+from inspect import iscode
+from types import FunctionType
+
+from callgraph import finder
+from callgraph.utils import getsource
+
+def_re = re.compile("^def", re.MULTILINE)
+class_re = re.compile("^class", re.MULTILINE)
+
+def scan_const_source(function, name):
+    for obj in function.__code__.co_consts:
+        if not iscode(obj): continue
+        if not obj.co_name == name: continue
+        source = getsource(obj)
+        if def_re.search(source):
+            try:
+                return FunctionType(obj, function.__globals__.copy())
+            except TypeError: return None
+        if class_re.search(source):
+            class_dict = {}
+            eval(obj, function.__globals__.copy(), class_dict)
+            return type(name, (), class_dict)
+
+def local_helpers(texts):
+    class Collector(object):
+        def __init__(self):
+            self.items = []
+
+        def add(self, item):
+            self.items.append(item)
+
+    def normalize(text):
+        return text.strip().lower()
+
+    def split(text):
+        return normalize(text).split()
+
+    collector = Collector()
+    for text in texts:
+        for word in split(text):
+            collector.add(word)
+    return collector.items
+
+def measure(scan_const, number=2000):
+    names = ["Collector", "normalize", "split"]
+    def lookup():
+        for name in names: scan_const(local_helpers, name)
+    best = min(repeat(lookup, number=number, repeat=5))
+    return best / number / len(names)
+
+if __name__ == "__main__":
+    source = measure(scan_const_source)
+    cached = measure(finder.scan_const)
+    print("scan_const with source and eval: {0:.2f}us".format(source * 1e6))
+    print("scan_const with cached objects:  {0:.2f}us".format(cached * 1e6))
+    print("speedup: {0:.1f}x".format(source / cached))
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Benchmark of the silent build. It compares the lazy silent
+#               printer with a printer that formats every message and
+#               throws it away (what silent builds did before).
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from timeit import repeat
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.indent_printer import IndentPrinter
+from benchmarks.corpus import main
+
+class DiscardingPrinter(IndentPrinter):
+    def __call__(self, *args):
+        " ".join(map(str, args))
+
+def build(printer):
+    builder = CallGraphBuilder(silent=True)
+    builder.printer = printer
+    builder.build(main)
+
+def measure(printer, number=20):
+    return min(repeat(lambda: build(printer), number=number, repeat=5))
+
+if __name__ == "__main__":
+    build(CallGraphBuilder(silent=True).printer)
+    lazy = measure(CallGraphBuilder(silent=True).printer)
+    eager = measure(DiscardingPrinter())
+    print("silent build with eager formatting: {0:.4f}s".format(eager))
+    print("silent build with lazy formatting:  {0:.4f}s".format(lazy))
+    print("formatting removed: {0:.1f}%".format(100 * (eager - lazy) / eager))
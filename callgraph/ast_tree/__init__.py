@@ -7,6 +7,7 @@
 # AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
 #
 
+from callgraph.utils import strip_indent
 from callgraph.ast_tree.base import Node
 from callgraph.ast_tree.simple import *
 from callgraph.ast_tree.stmt import *
@@ -23,9 +24,35 @@ def ast_parse(source):
     return tree
 
 class ASTTree(object):
-    def __init__(self, source):
-        self.tree = ast_parse(source)
-        self.name = self.tree.body[0].name
-        self.body = Node.make_root_nodes(self.tree.body[0].body)
-        self.decors = Node.make_root_nodes(self.tree.body[0].decorator_list)
+    """ Converted tree of function definition. The line numbers of all nodes
+        are line numbers in the source file.
+    """
 
+    def __init__(self, def_tree, lines, lineno):
+        self.lineno = lineno
+        self.lines = lines
+        self.name = def_tree.name
+        self.body = Node.make_root_nodes(def_tree.body)
+        self.decors = Node.make_root_nodes(def_tree.decorator_list)
+
+    @classmethod
+    def from_source(cls, source, lineno=1):
+        from ast import increment_lineno
+        tree = ast_parse(source)
+        increment_lineno(tree, lineno - 1)
+        return cls(tree.body[0], source.splitlines(True), lineno)
+
+    @property
+    def source(self):
+        return "".join(strip_indent(self.lines))
+
+    def source_line(self, lineno):
+        i = lineno - self.lineno
+        if 0 <= i < len(self.lines):
+            line = self.lines[i].rstrip("\r\n")
+            while line.endswith("\\") and i + 1 < len(self.lines):
+                i += 1
+                line = line.rstrip(" \t\\") + " " + self.lines[i].strip()
+            return line
+        pattern = "# invalid lineno: lines={0}, line={1}"
+        return pattern.format(len(self.lines), i)
@@ -45,23 +45,19 @@ class NodeFactory(object, metaclass=NodeRegistry):
 
 class NodeBase(object):
     """ Node base class that contains implementation of common
-        functionality for all AST nodes.
+        functionality for all AST nodes. The _fields are names of the
+        attributes holding the children (and other data) of the node.
     """
 
+    _fields = ()
+
     def __init__(self, parent, expr_tree):
         self.local = NodeLocalVariables()
         self.ast_name = expr_tree.__class__.__name__
         if hasattr(expr_tree, "lineno"):
-            self.lineno = expr_tree.lineno - 1
+            self.lineno = expr_tree.lineno
         else:
             self.lineno = parent.lineno
-        self._fields = []
-
-    def __setattr__(self, name, value):
-        object.__setattr__(self, name, value)
-        if hasattr(self, "_fields"):
-            if name != "_fields" and name not in self._fields:
-                self._fields.append(name)
 
     def node_fields(self):
         for field_name in self._fields:
@@ -110,9 +106,7 @@ class UnknownNode(Node):
     """ The class for all nodes that are not implemented.
     """
 
-    def __init__(self, parent, expr_tree):
-        super().__init__(parent, expr_tree)
-        self._fields.append("ast_name")
+    _fields = ("ast_name",)
 
     def evaluate(self, printer, ctx):
         printer("! Skipping unknown ast node:", self)
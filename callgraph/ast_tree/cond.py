@@ -18,6 +18,8 @@ from callgraph.ast_tree.helpers import VariablesScope
 from callgraph.ast_tree.helpers import UniqueNameGenerator
 
 class IfNode(Node):
+    _fields = ("test", "body", "orelse")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.test = self.make_node(expr_tree.test)
@@ -32,6 +34,8 @@ class IfNode(Node):
             yield from node.evaluate(printer, ctx)
 
 class IfExpNode(Node):
+    _fields = ("test", "body", "orelse")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.test = self.make_node(expr_tree.test)
@@ -50,6 +54,8 @@ class IfExpNode(Node):
         return merge_symbols("__if__", body, orelse)
 
 class ForNode(Node):
+    _fields = ("target", "foriter", "body", "orelse")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.target = self.make_node(expr_tree.target)
@@ -102,6 +108,8 @@ class ForNode(Node):
                 self.target.store(printer, ctx, symbol)
 
 class WhileNode(Node):
+    _fields = ("test", "body", "orelse")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.test = self.make_node(expr_tree.test)
@@ -116,6 +124,8 @@ class WhileNode(Node):
             yield from node.evaluate(printer, ctx)
 
 class WithNode(Node):
+    _fields = ("items", "body")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.items = self.make_nodes(expr_tree.items)
@@ -132,6 +142,8 @@ class WithNode(Node):
                 yield from item.local.exit_expr.evaluate(printer, ctx)
 
 class WithItemNode(Node, UniqueNameGenerator):
+    _fields = ("enter_exprs",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
 
@@ -14,6 +14,8 @@ from callgraph.ast_tree import Node
 from callgraph.ast_tree.helpers import VariablesScope
 
 class FunctionDefNode(Node):
+    _fields = ("name",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.name = expr_tree.name
@@ -24,6 +26,9 @@ class FunctionDefNode(Node):
         while False: yield None
 
 class ClassDefNode(Node):
+    _fields = ("name", "bases", "keywords", "starargs", "kwargs", "body",
+               "decors")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.name = expr_tree.name
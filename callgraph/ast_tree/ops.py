@@ -8,9 +8,12 @@
 #
 
 from callgraph.ast_tree import Node
-from callgraph.symbols import ConstantSymbol, merge_symbols
+from callgraph.symbols import make_constant, merge_symbols
 
 class UnaryOpBaseNode(Node):
+    _fields = ("operand",)
+    operand = None
+
     def load(self, printer, ctx):
         return self.operand.load(printer, ctx)
 
@@ -19,7 +22,7 @@ class InvertNode(UnaryOpBaseNode):
 
 class NotNode(UnaryOpBaseNode):
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, True)
+        return make_constant(ctx.builder, True)
 
 class UAddNode(UnaryOpBaseNode):
     pass
@@ -103,6 +106,8 @@ class NotInNode(Node):
 # TODO(burlog): do it in UnaryOpNode way
 
 class UnaryOpNode(Node):
+    _fields = ("operator",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.operator = self.make_node(expr_tree.op)
@@ -115,6 +120,8 @@ class UnaryOpNode(Node):
         return self.operator.load(printer, ctx)
 
 class BinOpNode(Node):
+    _fields = ("left", "operator", "right")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.left = self.make_node(expr_tree.left)
@@ -127,6 +134,8 @@ class BinOpNode(Node):
         yield from self.right.evaluate(printer, ctx)
 
 class BoolOpNode(Node):
+    _fields = ("operator", "operands")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.operator = self.make_node(expr_tree.op)
@@ -142,6 +151,8 @@ class BoolOpNode(Node):
         return merge_symbols("__boolop__", *symbols)
 
 class CompareNode(Node):
+    _fields = ("left", "operators", "comparators")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.left = self.make_node(expr_tree.left)
@@ -156,5 +167,5 @@ class CompareNode(Node):
             yield from comparator.evaluate(printer, ctx)
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, True)
+        return make_constant(ctx.builder, True)
 
@@ -8,7 +8,7 @@
 #
 
 from callgraph.ast_tree import Node
-from callgraph.symbols import ConstantSymbol
+from callgraph.symbols import make_constant
 from callgraph.symbols import IterableConstantSymbol
 from callgraph.symbols import MappingConstantSymbol
 
@@ -30,38 +30,48 @@ class Nonlocal(Node):
     pass
 
 class NameConstantNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = expr_tree.value
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, self.value)
+        return make_constant(ctx.builder, self.value)
 
 class StrNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = expr_tree.s
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, self.value)
+        return make_constant(ctx.builder, self.value)
 
 class BytesNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = expr_tree.s
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, self.value)
+        return make_constant(ctx.builder, self.value)
 
 class NumNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = expr_tree.n
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, self.value)
+        return make_constant(ctx.builder, self.value)
 
 class TupleNode(Node):
+    _fields = ("values",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.values = self.make_nodes(expr_tree.elts)
@@ -79,6 +89,8 @@ class TupleNode(Node):
             dst.store(printer, ctx, src)
 
 class ListNode(Node):
+    _fields = ("values",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.values = self.make_nodes(expr_tree.elts)
@@ -96,6 +108,8 @@ class ListNode(Node):
             dst.store(printer, ctx, src)
 
 class SetNode(Node):
+    _fields = ("values",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.values = self.make_nodes(expr_tree.elts)
@@ -109,6 +123,8 @@ class SetNode(Node):
         return IterableConstantSymbol(ctx.builder, set, values)
 
 class DictNode(Node):
+    _fields = ("keys", "values")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.keys = self.make_nodes(expr_tree.keys)
@@ -129,9 +145,11 @@ class EllipsisNode(Node):
         super().__init__(parent, expr_tree)
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, Ellipsis)
+        return make_constant(ctx.builder, Ellipsis)
 
 class KeywordNode(Node):
+    _fields = ("arg", "value")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.arg = expr_tree.arg
@@ -141,5 +159,5 @@ class KeywordNode(Node):
         yield from self.value.evaluate(printer, ctx)
 
     def load(self, printer, ctx):
-        return ConstantSymbol(ctx.builder, self.value)
+        return make_constant(ctx.builder, self.value)
 
@@ -16,11 +16,15 @@ from callgraph.symbols import make_result_symbol, merge_symbols
 from callgraph.ast_tree.helpers import VariablesScope
 
 class ExprNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = self.make_node(expr_tree.value)
 
 class AssignNode(Node):
+    _fields = ("targets", "value")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.targets = self.make_nodes(expr_tree.targets)
@@ -32,7 +36,19 @@ class AssignNode(Node):
             yield from target.evaluate(printer, ctx)
             target.store(printer, ctx, self.value.load(printer, ctx))
 
+class CallLocalVariables(object):
+    """ The callees and arguments of one evaluation of call node.
+    """
+    __slots__ = ("callee_symbols", "args", "kwargs")
+
+    def __init__(self):
+        self.callee_symbols = []
+        self.kwargs = {}
+        self.args = []
+
 class CallNode(Node):
+    _fields = ("func", "args", "keywords", "starargs", "kwargs")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.func = self.make_node(expr_tree.func)
@@ -40,30 +56,39 @@ class CallNode(Node):
         self.keywords = self.make_nodes(expr_tree.keywords)
         self.starargs = self.make_node(expr_tree.starargs)
         self.kwargs = self.make_node(expr_tree.kwargs)
-        self.local.callee_symbols = []
-        self.local.kwargs = {}
-        self.local.args = []
+
+    def reset_local(self, ctx):
+        # the ast trees are shared between all builders and evaluations of
+        # the function so the state is kept by the evaluated callgraph node
+        local = ctx.builder.tot.own_ast_locals()[self] = CallLocalVariables()
+        return local
+
+    def get_local(self, ctx):
+        local = ctx.builder.tot.ast_locals.get(self, None)
+        return local if local is not None else CallLocalVariables()
 
     def eval_node(self, printer, ctx):
+        local = self.reset_local(ctx)
         yield from self.func.evaluate(printer, ctx)
-        yield from self.unroll_args(printer, ctx)
-        yield from self.unroll_kwargs(printer, ctx)
+        yield from self.unroll_args(printer, ctx, local)
+        yield from self.unroll_kwargs(printer, ctx, local)
         for obj_symbol in self.func.load(printer, ctx).values():
             callee_symbol = self.expand(printer, ctx, obj_symbol)
             printer("- New callee discovered:", callee_symbol)
-            yield callee_symbol, self.local.args, self.local.kwargs
-            self.local.callee_symbols.append(callee_symbol)
+            yield callee_symbol, local.args, local.kwargs
+            local.callee_symbols.append(callee_symbol)
 
     def load(self, printer, ctx):
-        callee_symbol = merge_symbols(self.nick(), *self.local.callee_symbols)
+        local = self.get_local(ctx)
+        callee_symbol = merge_symbols(self.nick(local), *local.callee_symbols)
         result_symbol = make_result_symbol(ctx.builder, callee_symbol)
         if not result_symbol:
             printer("? Can't load callee result:", callee_symbol)
         return result_symbol
 
-    def nick(self):
-        if not self.local.callee_symbols: return "__callee_result__"
-        return "_or_".join(map(lambda x: x.name, self.local.callee_symbols))
+    def nick(self, local):
+        if not local.callee_symbols: return "__callee_result__"
+        return "_or_".join(map(lambda x: x.name, local.callee_symbols))
 
     def expand(self, printer, ctx, obj_symbol):
         if not obj_symbol or not isclass(obj_symbol.value): return obj_symbol
@@ -71,22 +96,22 @@ class CallNode(Node):
             or printer("? Can't extract __init__:", obj_symbol)\
             or obj_symbol
 
-    def unroll_args(self, printer, ctx):
+    def unroll_args(self, printer, ctx, local):
         for arg in self.args:
             yield from arg.evaluate(printer, ctx)
-            self.local.args.append(arg.load(printer, ctx))
+            local.args.append(arg.load(printer, ctx))
         if self.starargs:
             yield from self.starargs.evaluate(printer, ctx)
             starargs = self.starargs.load(printer, ctx)
             if starargs.isiterable():
                 for stararg in starargs:
-                    self.local.args.append(stararg)
+                    local.args.append(stararg)
             else: printer("? Can't unroll *args:", starargs)
 
-    def unroll_kwargs(self, printer, ctx):
+    def unroll_kwargs(self, printer, ctx, local):
         for keyword in self.keywords:
             yield from keyword.evaluate(printer, ctx)
-            self.local.kwargs[keyword.arg] = keyword.value.load(printer, ctx)
+            local.kwargs[keyword.arg] = keyword.value.load(printer, ctx)
         if self.kwargs:
             yield from self.kwargs.evaluate(printer, ctx)
             kwargs = self.kwargs.load(printer, ctx)
@@ -94,12 +119,14 @@ class CallNode(Node):
                 for key_symbol, value_symbol in kwargs.__iter_items__():
                     for key in key_symbol.values():
                         if isinstance(key.value, str):
-                            self.local.kwargs[key.value] = value_symbol
+                            local.kwargs[key.value] = value_symbol
                             continue
                         printer("? Skipping dynamic subscription:", key_symbol)
             else: printer("? Can't unroll **kwargs:", kwargs)
 
 class NameNode(Node):
+    _fields = ("name", "action")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.name = expr_tree.id
@@ -115,11 +142,14 @@ class NameNode(Node):
 
     def store(self, printer, ctx, value):
         if value:
-            printer("* Storing variable:", self.name + "=" + str(value))
+            printer.format("* Storing variable: {0}={1}", self.name, value)
             ctx.set(self.name, value)
-        else: printer("? Can't store variable:", self.name + "=" + str(value))
+        else:
+            printer.format("? Can't store variable: {0}={1}", self.name, value)
 
 class AttributeNode(Node):
+    _fields = ("value", "attr", "action")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = self.make_node(expr_tree.value)
@@ -133,18 +163,20 @@ class AttributeNode(Node):
     def load(self, printer, ctx):
         symbol = self.value.load(printer, ctx)
         return symbol.get(self.attr, free=False)\
-            or printer("? Can't load attr:", str(symbol) + "." + self.attr)\
+            or printer.format("? Can't load attr: {0}.{1}", symbol, self.attr)\
             or InvalidSymbol(ctx.builder, self.attr)
 
     def store(self, printer, ctx, value):
         symbol = self.value.load(printer, ctx)
         if symbol:
-            name = str(symbol) + "." + self.attr
-            printer("* Storing attr variable:", name + "=" + str(value))
+            printer.format("* Storing attr variable: {0}.{1}={2}",
+                           symbol, self.attr, value)
             symbol.set(self.attr, value)
-        else: printer("? Can't store attr:", str(symbol) + "." + self.attr)
+        else: printer.format("? Can't store attr: {0}.{1}", symbol, self.attr)
 
 class RaiseNode(Node):
+    _fields = ("exc", "cause")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.exc = self.make_node(expr_tree.exc)
@@ -155,6 +187,8 @@ class RaiseNode(Node):
             yield from self.exc.evaluate(printer, ctx)
 
 class ReturnNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = self.make_node(expr_tree.value)
@@ -164,10 +198,12 @@ class ReturnNode(Node):
             yield from self.value.evaluate(printer, ctx)
             symbol = self.value.load(printer, ctx)
             if symbol:
-                printer("* Function can return:", str(symbol))
+                printer("* Function can return:", symbol)
                 ctx.can_return(symbol)
 
 class YieldNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = self.make_node(expr_tree.value)
@@ -177,10 +213,12 @@ class YieldNode(Node):
             yield from self.value.evaluate(printer, ctx)
             symbol = self.value.load(printer, ctx)
             if symbol:
-                printer("* Function can yield:", str(symbol))
+                printer("* Function can yield:", symbol)
                 ctx.can_yield(symbol)
 
 class YieldFromNode(Node):
+    _fields = ("value",)
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.value = self.make_node(expr_tree.value)
@@ -190,10 +228,12 @@ class YieldFromNode(Node):
             yield from self.value.evaluate(printer, ctx)
             symbol = self.value.load(printer, ctx)
             if symbol:
-                printer("* Function can yield from:", str(symbol))
+                printer("* Function can yield from:", symbol)
                 ctx.can_yield_from(symbol)
 
 class TryNode(Node):
+    _fields = ("body", "handlers", "orelse", "finalbody")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.body = self.make_nodes(expr_tree.body)
@@ -212,6 +252,8 @@ class TryNode(Node):
             yield from expr.evaluate(printer, ctx)
 
 class ExceptHandlerNode(Node):
+    _fields = ("name", "excs", "body")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.name = expr_tree.name
@@ -221,7 +263,8 @@ class ExceptHandlerNode(Node):
     def eval_node(self, printer, ctx):
         with VariablesScope(ctx) as scope:
             for exc in self.get_excs_symbols(printer, ctx):
-                printer("* Storing exc variable:", self.name + "=" + str(exc))
+                printer.format("* Storing exc variable: {0}={1}",
+                               self.name, exc)
                 ctx.set(self.name, exc)
             scope.freeze()
             for expr in self.body:
@@ -238,6 +281,8 @@ class ExceptHandlerNode(Node):
         self.target.store(printer, ctx, symbol)
 
 class AssertNode(Node):
+    _fields = ("msg", "test")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.msg = expr_tree.msg
@@ -247,6 +292,8 @@ class AssertNode(Node):
         yield from self.test.evaluate(printer, ctx)
 
 class LambdaNode(Node):
+    _fields = ("args", "body")
+
     def __init__(self, parent, expr_tree):
         super().__init__(parent, expr_tree)
         self.args = expr_tree.args
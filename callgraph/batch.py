@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Builds callgraphs of many root functions in process pool.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import os, time, traceback
+from itertools import count
+from importlib import import_module
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from callgraph.builder import CallGraphBuilder
+
+CompactNode = namedtuple("CompactNode",
+                         "depth id name qualname invalid called_at")
+
+BatchResult = namedtuple("BatchResult", "root result error elapsed")
+
+class CompactTree(object):
+    """ Picklable callgraph tree stored as flat list of nodes in depth first
+        order. It doesn't hold any symbols and the depth of tree isn't limited
+        by python recursion.
+    """
+
+    def __init__(self, root):
+        self.nodes = []
+        stack = [(0, root)]
+        while stack:
+            depth, node = stack.pop()
+            self.nodes.append(CompactNode(depth, node.id, node.name,
+                                          node.qualname, node.invalid,
+                                          list(node.called_at)))
+            for child in reversed(node.children):
+                stack.append((depth + 1, child))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        yield from self.nodes
+
+def resolve_root(reference):
+    """ Returns the object for reference in form "package.module:qualname".
+    """
+    module_name, _, qualname = reference.partition(":")
+    obj = import_module(module_name)
+    for name in filter(None, qualname.split(".")):
+        obj = getattr(obj, name)
+    return obj
+
+# the summaries kept by the worker builder between roots
+batch_summary_limit = 4096
+
+batch_ids = count()
+worker_state = {}
+
+def worker_builder(batch_id, builder_kwargs):
+    """ Returns the builder of batch. Each worker keeps one builder so the
+        summaries stay warm between roots, the builder of previous batch is
+        dropped. The builder kwargs are copied with each chunk so the batch
+        is recognized by its id.
+    """
+    if worker_state.get("batch_id") != batch_id:
+        worker_state.clear()
+        worker_state["builder"] = CallGraphBuilder(**builder_kwargs)
+        worker_state["batch_id"] = batch_id
+    return worker_state["builder"]
+
+def build_root(batch_id, reference, kwargs, graph, builder_kwargs):
+    start = time.time()
+    try:
+        builder = worker_builder(batch_id, builder_kwargs)
+        function = resolve_root(reference)
+        try:
+            if graph:
+                result = builder.build_graph(function, kwargs)
+            else: result = CompactTree(builder.build(function, kwargs))
+        finally: builder.clear_caches()
+        return BatchResult(reference, result, None, time.time() - start)
+    except Exception:
+        error = traceback.format_exc()
+        return BatchResult(reference, None, error, time.time() - start)
+
+def build_chunk(batch_id, references, kwargs, graph, builder_kwargs):
+    return [build_root(batch_id, reference, kwargs, graph, builder_kwargs)
+            for reference in references]
+
+def build_batch(roots, workers=None, chunksize=1, kwargs={}, graph=False,
+                **builder_kwargs):
+    """ Builds callgraphs of all roots and yields BatchResult for each root
+        as soon as its chunk is done. The roots are references in form
+        "package.module:qualname". The result is CompactTree or CallGraph
+        if graph is True. Failure of one root is reported in its result's
+        error and doesn't stop the batch. The workers=0 builds all roots in
+        this process. At most summary_limit summaries are kept between roots
+        by each worker.
+    """
+    builder_kwargs.setdefault("silent", True)
+    builder_kwargs.setdefault("summary_limit", batch_summary_limit)
+    batch_id = "{0}:{1}".format(os.getpid(), next(batch_ids))
+    roots = list(roots)
+    chunks = [roots[i:i + chunksize] for i in range(0, len(roots), chunksize)]
+    if workers == 0:
+        try:
+            for chunk in chunks:
+                yield from build_chunk(batch_id, chunk, kwargs, graph,
+                                       builder_kwargs)
+        finally: worker_state.clear()
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = dict((executor.submit(build_chunk, batch_id, chunk, kwargs,
+                                        graph, builder_kwargs), chunk)
+                       for chunk in chunks)
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except Exception:
+                error = traceback.format_exc()
+                for reference in futures[future]:
+                    yield BatchResult(reference, None, error, 0.0)
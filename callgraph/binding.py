@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Binding of argument symbols to parameters of callees.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from inspect import signature, Parameter
+
+from callgraph.symbols import UnarySymbol
+
+positional_kinds = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD)
+
+class BindingPlan(object):
+    """ The signature of callee prepared for binding of argument symbols. It
+        is made once per callee. The symbols of defaults are made on each
+        binding because the callee can store attributes into them. The
+        callees with positional parameters only are bound without
+        Signature.bind_partial(), the others and the calls that can't be
+        bound (bind_partial raises) go through it.
+    """
+    __slots__ = ("builder", "signature", "names", "keywords", "var_keyword",
+                 "simple", "defaults")
+
+    def __init__(self, builder, function):
+        self.builder = builder
+        self.signature = signature(function)
+        params = list(self.signature.parameters.values())
+        self.names = tuple(param.name for param in params)
+        self.keywords = frozenset(param.name for param in params
+                                  if param.kind == param.POSITIONAL_OR_KEYWORD)
+        self.var_keyword = any(param.kind == param.VAR_KEYWORD
+                               for param in params)
+        self.simple = all(param.kind in positional_kinds for param in params)
+        self.defaults = tuple((param.name, param.default) for param in params
+                              if param.default is not param.empty)
+
+    def bind(self, args, kwargs, myself=None):
+        """ Returns dict of bound arguments in order of parameters followed
+            by the defaults of the missing ones. The args and kwargs are not
+            modified.
+        """
+        if myself and self.names:
+            # TODO(burlog): better bound method detection
+            if self.names[0] == "self": args = [myself] + list(args)
+            else: kwargs = dict(kwargs, self=myself)
+        if not self.var_keyword and not self.keywords.issuperset(kwargs):
+            kwargs = dict((k, v) for k, v in kwargs.items()
+                          if k in self.keywords)
+
+        if self.simple and len(args) <= len(self.names)\
+                and kwargs.keys().isdisjoint(self.names[:len(args)]):
+            arguments = dict(zip(self.names, args))
+            if kwargs:
+                for name in self.names[len(args):]:
+                    if name in kwargs: arguments[name] = kwargs[name]
+        else:
+            bound = self.signature.bind_partial(*args, **kwargs)
+            arguments = dict(bound.arguments)
+
+        for name, default in self.defaults:
+            if name not in arguments:
+                arguments[name] = UnarySymbol(self.builder, name, default)
+        return arguments
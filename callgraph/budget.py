@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Limits of the callgraph build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from time import perf_counter
+from collections import namedtuple
+
+Truncation = namedtuple("Truncation", "name qualname filename lineno reason")
+
+class Budget(object):
+    """ Limits of total number of nodes, depth of calls, evaluation time of
+        one function and wall-clock time of whole build. The node that runs
+        out of budget isn't evaluated further, it is marked as truncated and
+        reported in report list. The times are checked between the callees
+        so one long statement can overrun them.
+    """
+
+    def __init__(self, max_nodes=None, max_depth=None, function_time=None,
+                 total_time=None):
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self.function_time = function_time
+        self.total_time = total_time
+        self.start()
+
+    def __bool__(self):
+        return any(x is not None for x in (self.max_nodes, self.max_depth,
+                                           self.function_time,
+                                           self.total_time))
+
+    def start(self):
+        self.nodes = 0
+        self.started = perf_counter()
+        self.report = []
+
+    def is_full(self):
+        return self.max_nodes is not None and self.nodes >= self.max_nodes
+
+    def is_expired(self):
+        if self.total_time is None: return False
+        return perf_counter() - self.started > self.total_time
+
+    def check_enter(self, depth):
+        """ Returns the reason why the function at depth can't be evaluated.
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            return "max_depth"
+        if self.is_expired(): return "total_time"
+
+    def check_frame(self, frame):
+        """ Returns the reason why the frame can't continue the evaluation.
+        """
+        if self.is_full(): return "max_nodes"
+        if self.is_expired(): return "total_time"
+        if self.function_time is not None:
+            if frame.elapsed > self.function_time: return "function_time"
+
+    def truncate(self, node, reason):
+        if node.truncated: return
+        node.truncated = reason
+        self.report.append(Truncation(node.name, node.qualname, node.filename,
+                                      node.lineno, reason))
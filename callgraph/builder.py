@@ -8,13 +8,21 @@
 #
 
 from operator import attrgetter
-from inspect import signature
+from collections import deque
 
 from callgraph.hooks import Hooks
 from callgraph.utils import AuPair
 from callgraph.symbols import Symbol, UnarySymbol
 from callgraph.symbols import IterableConstantSymbol, MappingConstantSymbol
-from callgraph.nodes import make_node
+from callgraph.nodes import make_node, CallEdge
+from callgraph.summary import Summary, SummaryCache
+from callgraph.budget import Budget
+from callgraph.binding import BindingPlan
+from callgraph.incremental import Dependencies, symbol_filenames
+from callgraph.engine import Frame, make_engine
+from callgraph.graph import CallGraph
+from callgraph.finder import NameIndex
+from callgraph.hierarchy import ClassIndex
 from callgraph.indent_printer import IndentPrinter, NonePrinter, dump_tree
 
 # TODO(burlog): hooks as callbacks
@@ -25,24 +33,40 @@ from callgraph.indent_printer import IndentPrinter, NonePrinter, dump_tree
 # TODO(burlog): make result of list(), tuple(), dict(), ... iterable
 
 class CallGraphBuilder(object):
-    def __init__(self, global_variables={}, silent=False):
+    def __init__(self, global_variables={}, silent=False,
+                 summary_precision=None, order="dfs", priority=None,
+                 budget=None, overrides=False, summary_limit=None):
         self.printer = NonePrinter() if silent else IndentPrinter()
+        self.constants = {}
+        self.builtins = {}
+        self.names = NameIndex()
+        self.plans = {}
+        self.classes = ClassIndex()
+        self.node_keys = {}
+        self.overrides = overrides
+        self.engine = make_engine(self, order, priority)
         self.global_symbols = self.make_kwargs_symbols(global_variables)
+        self.summaries = SummaryCache(summary_precision, summary_limit)
+        self.budget = budget or Budget()
+        self.dependencies = Dependencies()
         self.hooks = Hooks(self)
         self.current_lineno = 0
         self.tot = None
+        self.graph = None
+        self.stream = None
 
     def print_banner(self, printer, node):
+        if not printer.enabled: return
         extra = "<" + node.qualname + "> " if node.qualname != node.name else ""
-        printer("@ Analyzing: {0} {1}at {2}:{3}"\
-                .format(node.ast.name, extra, node.filename, node.lineno))
+        printer.format("@ Analyzing: {0} {1}at {2}:{3}",
+                       node.ast.name, extra, node.filename, node.lineno)
 
-    def set_current_lineno(self, printer, expr_lineno):
-        lineno = self.tot.lineno + expr_lineno
+    def set_current_lineno(self, printer, lineno):
         if lineno == self.current_lineno: return
         self.current_lineno = lineno
-        printer("+ line at {0}:{1}".format(self.tot.filename, lineno))
-        printer("+", self.tot.source_line(expr_lineno).strip())
+        if not printer.enabled: return
+        printer.format("+ line at {0}:{1}", self.tot.filename, lineno)
+        printer("+", self.tot.source_line(file_lineno=lineno).strip())
 
     def make_kwargs_symbols(self, kwargs):
         return dict((k, UnarySymbol(self, k, v)) for k, v in kwargs.items())
@@ -50,72 +74,210 @@ class CallGraphBuilder(object):
     def build(self, function, kwargs={}):
         self.root = None
         self.hooks.clear()
+        self.names.clear()
+        self.classes.clear()
+        self.node_keys.clear()
+        self.budget.start()
         symbol = UnarySymbol(self, function.__name__, function)
         return self.process(symbol, kwargs=self.make_kwargs_symbols(kwargs))
 
+    def build_graph(self, function, kwargs={}):
+        self.graph, self.graph_symbols = CallGraph(), {}
+        try:
+            self.build(function, kwargs)
+            return self.graph
+        finally: self.graph, self.graph_symbols = None, None
+
+    def iter_edges(self, function, kwargs={}):
+        """ Yields CallEdge for each call as soon as it is discovered. The
+            first edge has no caller and holds the root node. The nodes are
+            not linked to their parents' children so the memory does not
+            grow with the callgraph.
+        """
+        self.hooks.clear()
+        self.names.clear()
+        self.classes.clear()
+        self.node_keys.clear()
+        self.budget.start()
+        self.stream = deque()
+        symbol = UnarySymbol(self, function.__name__, function)
+        kwargs = self.make_kwargs_symbols(kwargs)
+        try:
+            with AuPair(self, self.tot):
+                node, frame = self.enter(symbol, None, [], kwargs)
+            yield from self.drain_stream()
+            if not frame: return
+            for _ in self.engine.iterate(frame):
+                yield from self.drain_stream()
+        finally: self.stream = None
+
+    def drain_stream(self):
+        while self.stream:
+            yield self.stream.popleft()
+
+    def clear_caches(self):
+        """ Drops the symbols of constants and builtins and the binding plans
+            that are kept between builds. The summaries are kept.
+        """
+        self.constants.clear()
+        self.builtins.clear()
+        self.plans.clear()
+
+    def invalidate(self, filenames=None):
+        """ Drops the summaries that depend on the changed files and returns
+            the files. The changed files are detected by their mtime and size
+            if filenames is None.
+        """
+        if filenames is None: filenames = self.dependencies.changed_files()
+        self.summaries.invalidate(self.dependencies.affected(filenames))
+        self.dependencies.refresh(filenames)
+        return filenames
+
+    def purge(self, filenames):
+        """ Drops the summaries and binding plans of functions from files,
+            their code is gone once the modules are reloaded.
+        """
+        self.summaries.purge(filenames)
+        filenames = set(filenames)
+        for function in list(self.plans):
+            code = getattr(getattr(function, "__func__", function),
+                           "__code__", None)
+            if code is not None and code.co_filename in filenames:
+                del self.plans[function]
+
     def process(self, symbol, parent=None, args=[], kwargs={}):
+        with AuPair(self, self.tot):
+            node, frame = self.enter(symbol, parent, args, kwargs)
+            if frame: self.engine.run(frame)
+        return node
+
+    def enter(self, symbol, parent=None, args=[], kwargs={}, depth=0):
         # attach new node to parent list
-        node = make_node(symbol)
+        node = make_node(symbol, self.node_keys)
         with AuPair(self, node):
-            if parent:
-                where = parent.filename, self.current_lineno
-                if not parent.attach(node, where): return node
+            if parent and self.budget.is_full():
+                self.truncate(parent, "max_nodes")
+                return node, None
+            if not self.attach(parent, node, args, kwargs): return node, None
+            self.budget.nodes += 1
 
             # builtins or c/c++ objects have no code
-            if node.is_opaque: return node
-            if not symbol.iscallable(): return node
+            if node.is_opaque: return node, None
+            if not symbol.iscallable(): return node, None
+            self.dependencies.add(parent, node)
+            self.names.resolve(symbol.value)
+
+            # the function is out of budget
+            reason = self.budget.check_enter(depth)
+            if reason:
+                self.truncate(node, reason)
+                return node, None
 
             # print nice banner
             self.print_banner(self.printer, node)
 
-            # magic follows
-            with self.printer as printer:
-                self.inject_arguments(printer, node, args, kwargs)
-                self.process_function(printer, node, args, kwargs)
-        return node
+            # magic follows, the frame leaves the indentation
+            printer = self.printer.__enter__()
+            bound = self.inject_arguments(printer, node, args, kwargs)
+            if not self.summaries:
+                callees = self.function_callees(printer, node)
+            else: callees = self.summary_callees(printer, node, bound)
+        return node, Frame(self, node, printer, callees, depth)
+
+    def attach(self, parent, node, args=[], kwargs={}):
+        where = (parent.filename, self.current_lineno) if parent else None
+        path = self.engine.path_of(parent) if parent else None
+        if self.stream is not None or self.graph is not None:
+            ancestor = None
+            if path is not None: ancestor = path.get(node.key, None)
+            elif parent is not None: ancestor = parent.find_ancestor(node)
+            node.parent = parent
+        if self.stream is not None:
+            recursive = ancestor is not None
+            self.stream.append(CallEdge(parent, node, where, recursive))
+            return not recursive
+        if self.graph is None:
+            return parent.attach(node, where, path) if parent else True
+        new = self.graph.attach(parent, node, where)
+        if node.is_opaque or not node.symbol.iscallable(): return new
+
+        # the function is evaluated once per abstraction of its arguments
+        key = self.arguments_key(node, args, kwargs)
+        origins = self.graph_symbols.setdefault(node.id, {})
+        origin = origins.get(key, None)
+        if origin is None and (new or ancestor is None):
+            origins[key] = node.symbol
+            return True
+        if origin is None: origin = next(iter(origins.values()))
+        if origin is not node.symbol:
+            node.symbol.add_returns(origin.return_list)
+            node.symbol.add_yields(origin.yield_list)
+        return False
 
-    def process_function(self, printer, node, args, kwargs):
+    def arguments_key(self, node, args, kwargs):
+        """ Returns the key of summary for the arguments bound to function of
+            node, see SummaryCache.make_key.
+        """
+        plan = self.binding_plan(node.symbol.value)
+        bound = plan.bind(args, kwargs, node.symbol.myself).items()
+        bound = [(name, self.as_symbol(value)) for name, value in bound]
+        return self.summaries.make_key(node, bound)
+
+    def truncate(self, node, reason):
+        self.budget.truncate(node, reason)
+        if self.graph is not None and node.id in self.graph.vertices:
+            self.graph[node.id].truncated = node.truncated
+
+    def function_callees(self, printer, node, summary=None):
         for expr in node.ast.body:
             for callee, args, kwargs in expr.evaluate(printer, node.symbol):
-                self.process(callee, node, args.copy(), kwargs.copy())
+                if summary:
+                    lineno = self.current_lineno
+                    summary.add_callee(callee, args, kwargs, lineno)
+                yield callee, args, kwargs
+
+    def summary_callees(self, printer, node, bound):
+        key = self.summaries.make_key(node, bound)
+        summary = self.summaries.find(key)
+        if summary:
+            yield from self.replay_callees(printer, node, bound, summary)
+        else:
+            summary = Summary(bound)
+            returns = len(node.symbol.return_list)
+            yields = len(node.symbol.yield_list)
+            yield from self.function_callees(printer, node, summary)
+            summary.finish(node.symbol, bound, returns, yields)
+            self.summaries.store(key, summary)
+            filenames = symbol_filenames(summary.symbols())
+            self.dependencies.add_references(node, filenames)
+
+    def replay_callees(self, printer, node, bound, summary):
+        printer("= Replaying summary of:", node.qualname)
+        for callee, args, kwargs, lineno in summary.callees:
+            self.set_current_lineno(printer, lineno)
+            yield callee, args, kwargs
+        summary.replay_stores(bound)
+        node.symbol.add_returns(summary.returns)
+        node.symbol.add_yields(summary.yields)
 
     def inject_arguments(self, printer, node, args, kwargs):
-        sig = signature(node.symbol.value)
-        self.inject_self(printer, node, sig, args, kwargs)
-        bound = sig.bind_partial(*args, **self.polish_kwargs(sig, kwargs))
-        self.inject_defaults(printer, node, sig, bound)
-        for name, value in bound.arguments.items():
+        plan = self.binding_plan(node.symbol.value)
+        result = []
+        for name, value in plan.bind(args, kwargs, node.symbol.myself).items():
             value_symbol = self.as_symbol(value)
-            printer("% Binding argument:", name + "=" + str(value_symbol))
+            printer.format("% Binding argument: {0}={1}", name, value_symbol)
             node.symbol.set(name, value_symbol)
+            result.append((name, value_symbol))
+        return result
 
-    def polish_kwargs(self, sig, kwargs):
-        for param in sig.parameters.values():
-            if param.kind == param.VAR_KEYWORD:
-                return kwargs
-        return dict(self.iter_kwargs(sig, kwargs))
-
-    def iter_kwargs(self, sig, kwargs):
-        for param in sig.parameters.values():
-            if param.kind == param.POSITIONAL_OR_KEYWORD:
-                if param.name in kwargs:
-                    yield param.name, kwargs[param.name]
-
-    def inject_self(self, printer, node, sig, args, kwargs):
-        if node.symbol.myself and sig.parameters:
-            # TODO(burlog): better bound method detection
-            if next(iter(sig.parameters.keys())) == "self":
-                args.insert(0, node.symbol.myself)
-            else:
-                # TODO(burlog): improve detection logic
-                kwargs["self"] = node.symbol.myself
-
-    def inject_defaults(self, printer, node, sig, bound):
-        for param in sig.parameters.values():
-            if param.name not in bound.arguments:
-                 if param.default is not param.empty:
-                     symbol = UnarySymbol(self, param.name, param.default)
-                     bound.arguments[param.name] = symbol
+    def binding_plan(self, function):
+        try:
+            plan = self.plans.get(function, None)
+        except TypeError:
+            return BindingPlan(self, function)
+        if plan is None:
+            plan = self.plans[function] = BindingPlan(self, function)
+        return plan
 
     def as_symbol(self, value):
         if isinstance(value, Symbol):
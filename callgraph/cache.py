@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Process wide caches of parsed code.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import os, pickle
+from weakref import ref
+from hashlib import sha1
+from tempfile import mkstemp
+from collections import OrderedDict
+
+from callgraph.utils import ModuleSource
+
+class DiskCache(object):
+    """ Persistent cache of ast trees shared between processes. Every function
+        has its own entry that is valid as long as the source file has the
+        same mtime and size or, if they differ, the same content hash.
+    """
+
+    suffix = ".pickle"
+
+    # bump it when the layout of pickled ast tree nodes changes
+    format_version = 2
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.total_bytes = None
+        self.digests = {}
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, code):
+        key = "{0}:{1}:{2}:{3}".format(self.format_version, code.co_filename,
+                                       code.co_firstlineno, code.co_name)
+        name = sha1(key.encode("utf-8")).hexdigest() + self.suffix
+        return os.path.join(self.path, name)
+
+    def digest(self, filename, stat):
+        key = filename, stat.st_mtime_ns, stat.st_size
+        if key not in self.digests:
+            with open(filename, "rb") as source_file:
+                self.digests[key] = sha1(source_file.read()).hexdigest()
+        return self.digests[key]
+
+    def fetch(self, code, make_value):
+        try:
+            stat = os.stat(code.co_filename)
+        except OSError:
+            return make_value()
+        path = self.entry_path(code)
+        entry = self.read_entry(path)
+        if entry is not None and self.is_valid(entry, code, stat):
+            self.hits += 1
+            return entry[-1]
+        self.misses += 1
+        value = make_value()
+        entry = (self.format_version, code.co_filename, stat.st_mtime_ns,
+                 stat.st_size, self.digest(code.co_filename, stat), value)
+        self.write_entry(path, entry)
+        return value
+
+    def is_valid(self, entry, code, stat):
+        if len(entry) != 6 or entry[0] != self.format_version: return False
+        _, filename, mtime, size, digest, _ = entry
+        if filename != code.co_filename or size != stat.st_size: return False
+        if mtime == stat.st_mtime_ns: return True
+        return digest == self.digest(filename, stat)
+
+    def read_entry(self, path):
+        try:
+            with open(path, "rb") as entry_file:
+                entry = pickle.load(entry_file)
+            os.utime(path)
+            return entry
+        except (OSError, EOFError, ValueError, TypeError, AttributeError,
+                ImportError, IndexError, pickle.UnpicklingError):
+            return None
+
+    def write_entry(self, path, entry):
+        try:
+            data = pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        fd, tmp_path = mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as entry_file:
+                entry_file.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path): os.unlink(tmp_path)
+            return
+        self.evict(len(data))
+
+    def entries(self):
+        for name in os.listdir(self.path):
+            if not name.endswith(self.suffix): continue
+            try:
+                yield os.stat(os.path.join(self.path, name)), name
+            except OSError: pass
+
+    def evict(self, added_bytes):
+        if self.total_bytes is None:
+            self.total_bytes = sum(s.st_size for s, _ in self.entries())
+        else: self.total_bytes += added_bytes
+        if self.total_bytes <= self.max_bytes: return
+
+        # drop the least recently used entries
+        self.total_bytes = 0
+        entries = sorted(self.entries(), key=lambda x: x[0].st_mtime_ns)
+        for stat, name in reversed(entries):
+            if self.total_bytes + stat.st_size <= self.max_bytes:
+                self.total_bytes += stat.st_size
+                continue
+            try:
+                os.unlink(os.path.join(self.path, name))
+            except OSError: pass
+
+class ASTCache(object):
+    """ LRU cache of ast trees keyed by the code objects. The code objects are
+        held by weak references so entries disappear with their functions.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.disk = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, code):
+        return ref(code) in self.entries
+
+    def fetch(self, code, make_value):
+        key = ref(code, self.remove)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        if self.disk is not None:
+            value = self.disk.fetch(code, make_value)
+        else: value = make_value()
+        self.entries[key] = value
+        while self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    def use_disk_cache(self, path, **kwargs):
+        self.disk = DiskCache(path, **kwargs) if path else None
+
+    def remove(self, key):
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.entries), "max_size": self.max_size}
+
+class ModuleCache(object):
+    """ LRU cache of parsed source files keyed by the filenames. The entries
+        are reparsed when mtime or size of the file changes.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def fetch(self, filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        key = stat.st_mtime_ns, stat.st_size
+        entry = self.entries.get(filename, None)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            self.entries.move_to_end(filename)
+            return entry[1]
+        self.misses += 1
+        try:
+            module = ModuleSource(filename)
+        except (OSError, SyntaxError, ValueError):
+            module = None
+        self.entries[filename] = key, module
+        self.entries.move_to_end(filename)
+        while self.max_size is not None and len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return module
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.entries), "max_size": self.max_size}
+
+ast_cache = ASTCache()
+module_cache = ModuleCache()
@@ -12,7 +12,8 @@ from cached_property import cached_property
 from inspect import isclass, isbuiltin
 
 from callgraph.ast_tree import ASTTree
-from callgraph.utils import getsource
+from callgraph.utils import getsource, has_name
+from callgraph.cache import ast_cache, module_cache
 
 class Code(object): # TODO(burlog): meta?
     @property
@@ -23,28 +24,20 @@ class Code(object): # TODO(burlog): meta?
     def lineno(self):
         return self.code.co_firstlineno
 
-    @cached_property
+    @property
     def source(self):
-        return getsource(self.code)
+        return self.ast.source
 
     @cached_property
     def ast(self):
-        return ASTTree(self.source)
+        return ASTTree.from_source(getsource(self.code), self.lineno)
 
     @property
     def wraps(self):
         return None
 
-    def source_line(self, i):
-        lines = self.source.split("\n")
-        if 0 <= i < len(lines):
-            line = lines[i]
-            while line.endswith("\\"):
-                i += 1
-                line = line.rstrip(" \t\\") + " " + lines[i].lstrip(" \t")
-            return line
-        pattern = "# invalid lineno: lines={0}, line={1}"
-        return pattern.format(len(lines), i)
+    def source_line(self, lineno):
+        return self.ast.source_line(lineno)
 
 class TransparentCode(Code):
     def __init__(self, obj):
@@ -63,6 +56,18 @@ class TransparentCode(Code):
     def wraps(self):
         return self.wrapped_obj
 
+    @cached_property
+    def ast(self):
+        return ast_cache.fetch(self.code, self.make_ast)
+
+    def make_ast(self):
+        module = module_cache.fetch(self.filename)
+        def_tree = module.find(self.lineno) if module else None
+        if def_tree is None:
+            return ASTTree.from_source(getsource(self.code), self.lineno)
+        lines = module.block_lines(def_tree, self.lineno)
+        return ASTTree(def_tree, lines, self.lineno)
+
 class LambdaCode(Code):
     def __init__(self, ast_tree):
         self.ast_tree = ast_tree
@@ -92,7 +97,7 @@ class LambdaCode(Code):
     def ast(self):
         return self.ast_tree
 
-    def source_line(self, i):
+    def source_line(self, lineno):
         return "TODO(burlog): temporary nothing"
 
 class OpaqueCode(Code):
@@ -145,18 +150,18 @@ class InvalidCode(OpaqueCode):
                .format(self.obj)
 
 def make_code(obj):
-    if "__code__" in dir(obj):
+    if has_name(obj, "__code__"):
         return TransparentCode(obj)
-    if "__self__" in dir(obj):
-        if "__func__" in dir(obj):
+    if has_name(obj, "__self__"):
+        if has_name(obj, "__func__"):
             return TransparentCode(obj.__func__)
-        if "__class__" in dir(obj.__self__):
+        if has_name(obj.__self__, "__class__"):
             return OpaqueMethodCode(obj)
-    if "__objclass__" in dir(obj):
+    if has_name(obj, "__objclass__"):
         return OpaqueSlotCode(obj)
     if isbuiltin(obj): return OpaqueFunctionCode(obj)
     if isinstance(obj, ast.AST): return LambdaCode(obj)
     # TODO(burlog): __call__ and OpaqueFunctionCode is hack
-    if "__call__" in dir(obj): return OpaqueFunctionCode(obj.__call__)
+    if has_name(obj, "__call__"): return OpaqueFunctionCode(obj.__call__)
     return InvalidCode(obj)
 
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Callgraph build engines driving the function evaluations.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from time import perf_counter
+from heapq import heappush, heappop
+from itertools import count
+from collections import deque
+
+from callgraph.nodes import empty_index
+
+class Frame(object):
+    """ Suspended evaluation of one function. The callees generator yields
+        the callees discovered in the function body.
+    """
+
+    def __init__(self, builder, node, printer, callees, depth=0):
+        self.builder = builder
+        self.node = node
+        self.printer = printer
+        self.callees = callees
+        self.depth = depth
+        self.elapsed = 0.0
+
+    def step(self):
+        self.builder.tot = self.node
+        budget = self.builder.budget
+        if not budget: return next(self.callees, None)
+        reason = budget.check_frame(self)
+        if reason:
+            self.builder.truncate(self.node, reason)
+            return None
+        start = perf_counter()
+        try:
+            return next(self.callees, None)
+        finally: self.elapsed += perf_counter() - start
+
+    def __iter__(self):
+        while True:
+            callee = self.step()
+            if callee is None: break
+            yield callee
+
+    def close(self):
+        self.callees.close()
+        self.node.ast_locals = empty_index
+        self.printer.__exit__(None, None, None)
+
+class Engine(object):
+    """ Base class for engines that evaluate the frames without using python
+        recursion.
+    """
+
+    def __init__(self, builder):
+        self.builder = builder
+
+    def enter(self, frame, callee):
+        symbol, args, kwargs = callee
+        return self.builder.enter(symbol, frame.node, args, kwargs,
+                                  frame.depth + 1)[1]
+
+    def run(self, frame):
+        for _ in self.iterate(frame): pass
+
+    def iterate(self, frame):
+        """ Evaluates the frames and yields after each entered callee so the
+            caller can consume the discovered edges or stop the evaluation.
+        """
+        try:
+            yield from self.iter_frames(frame)
+        except BaseException:
+            self.abort()
+            raise
+
+    def iter_frames(self, frame):
+        raise NotImplementedError()
+
+    def path_of(self, node):
+        """ Returns mapping from keys to nodes on the path from root to node
+            if the engine knows it.
+        """
+        return None
+
+    def abort(self):
+        pass
+
+class DepthFirstEngine(Engine):
+    """ Evaluates the callee as soon as it is discovered so the callee's
+        results are known when the caller continues. It yields the same
+        results as the recursive evaluation.
+    """
+
+    def __init__(self, builder):
+        super().__init__(builder)
+        self.stack = []
+        self.path = {}
+
+    def iter_frames(self, frame):
+        # the frames on stack are the path from root to the top frame
+        self.stack, self.path = [frame], {frame.node.key: frame.node}
+        while self.stack:
+            frame = self.stack[-1]
+            callee = frame.step()
+            if callee is None:
+                self.path.pop(self.stack.pop().node.key, None)
+                frame.close()
+                continue
+            child = self.enter(frame, callee)
+            if child:
+                self.stack.append(child)
+                self.path[child.node.key] = child.node
+            yield
+
+    def path_of(self, node):
+        if self.stack and self.stack[-1].node is node: return self.path
+
+    def abort(self):
+        while self.stack: self.stack.pop().close()
+        self.path = {}
+
+class QueueEngine(Engine):
+    """ Evaluates the whole function before its callees are evaluated. The
+        callees are evaluated later in order given by the queue so results
+        of the callees aren't known to the caller.
+    """
+
+    def iter_frames(self, frame):
+        self.current = None
+        self.frames = self.make_queue()
+        self.push(frame)
+        while self.frames:
+            self.current = self.pop()
+            for callee in self.current:
+                child = self.enter(self.current, callee)
+                if child: self.push(child)
+                yield
+            self.current.close()
+            self.current = None
+
+    def abort(self):
+        if self.current: self.current.close()
+        while self.frames: self.pop().close()
+
+class BreadthFirstEngine(QueueEngine):
+    def make_queue(self):
+        return deque()
+
+    def push(self, frame):
+        self.frames.append(frame)
+
+    def pop(self):
+        return self.frames.popleft()
+
+class PriorityEngine(QueueEngine):
+    """ Evaluates the frames with the lowest priority first. The default
+        priority is depth of the function in callgraph.
+    """
+
+    def __init__(self, builder, priority=None):
+        super().__init__(builder)
+        self.priority = priority or (lambda frame: frame.depth)
+        self.counter = count()
+
+    def make_queue(self):
+        return []
+
+    def push(self, frame):
+        key = self.priority(frame), next(self.counter)
+        heappush(self.frames, (key, frame))
+
+    def pop(self):
+        return heappop(self.frames)[1]
+
+def make_engine(builder, order="dfs", priority=None):
+    if order == "dfs": return DepthFirstEngine(builder)
+    if order == "bfs": return BreadthFirstEngine(builder)
+    if order == "priority": return PriorityEngine(builder, priority)
+    raise ValueError("Unknown engine order: " + str(order))
@@ -7,40 +7,175 @@
 # AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
 #
 
-import ast, re, builtins
+import builtins
 from types import FunctionType
-from inspect import iscode, getclosurevars
+from inspect import iscode, ismodule, isclass, CO_OPTIMIZED
+from weakref import WeakKeyDictionary
 
-from callgraph.utils import getsource
+class NameTable(object):
+    """ The namespaces where the names of function are resolved: closure
+        cells keyed by free variable names, globals and builtins. The table
+        holds the live cells and dicts so it doesn't need any invalidation.
+        The consts are the objects made from nested code. They are shared
+        by all functions of the same code unless the code has free variables
+        because the nested functions are bound to the cells of function.
+    """
+    __slots__ = ("cells", "globals", "builtins", "consts")
 
-def_re = re.compile("^def", re.MULTILINE)
-class_re = re.compile("^class", re.MULTILINE)
+    def __init__(self, function):
+        code = function.__code__
+        self.cells = dict(zip(code.co_freevars, function.__closure__ or ()))
+        if code.co_freevars: self.consts = {}
+        else: self.consts = const_objects.setdefault(code, {})
+        self.globals = function.__globals__
+        self.builtins = self.globals.get("__builtins__", builtins.__dict__)
+        if ismodule(self.builtins): self.builtins = self.builtins.__dict__
+
+    def nonlocal_value(self, name):
+        cell = self.cells.get(name, None)
+        if cell is None: return None
+        try:
+            return cell.cell_contents
+        except ValueError: return None
+
+name_tables = WeakKeyDictionary()
+
+# the functions and classes made from nested code keyed by parent code that
+# has no free variables
+const_objects = WeakKeyDictionary()
+
+def name_table(function):
+    """ Returns the name table of function, it is made once per function.
+    """
+    function = getattr(function, "__func__", function)
+    try:
+        return name_tables[function]
+    except KeyError:
+        table = name_tables[function] = NameTable(function)
+        return table
+
+class NameIndex(object):
+    """ The names resolved during one build. The top-level names of module
+        (functions, classes, imported aliases, constants) together with the
+        builtins are indexed once per module dict and shared by all its
+        functions. The global and free names of function are resolved in one
+        batch, the names that aren't in the index are left to find_object.
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.functions = {}
+
+    def clear(self):
+        self.modules.clear()
+        self.functions.clear()
+
+    def module_index(self, table):
+        # the dict is kept in entry so its id can't be reused during build
+        entry = self.modules.get(id(table.globals), None)
+        if entry is None:
+            index = dict(table.builtins)
+            index.update(table.globals)
+            entry = self.modules[id(table.globals)] = table.globals, index
+        return entry[1]
+
+    def resolve(self, value):
+        """ Returns dict of objects of the global and free names of function.
+        """
+        try:
+            return self.functions[value]
+        except KeyError: pass
+        except TypeError: return {}
+        function = value.__init__ if isclass(value) else value
+        function = getattr(function, "__func__", function)
+        if function is not value: names = self.resolve(function)
+        elif isinstance(function, FunctionType):
+            names = self.resolve_function(function)
+        else: names = {}
+        self.functions[value] = names
+        return names
+
+    def resolve_function(self, function):
+        names = {}
+        code, table = function.__code__, name_table(function)
+        index = self.module_index(table)
+        local_names = set(code.co_varnames).union(code.co_cellvars)
+        for name in code.co_names:
+            if name in local_names: continue
+            value = index.get(name, None)
+            if value is not None: names[name] = value
+        for name in code.co_freevars:
+            value = table.globals.get(name, None)
+            if value is None: value = table.nonlocal_value(name)
+            if value is not None: names[name] = value
+            else: names.pop(name, None)
+        return names
+
+    def find(self, function, name):
+        return self.resolve(function).get(name, None)
 
 def scan_globals(function, name):
-    return function.__globals__.get(name, None)
+    return name_table(function).globals.get(name, None)
 
 def scan_closure(function, name):
-    closure_vars = getclosurevars(function)
-    return closure_vars.nonlocals.get(name,
-               closure_vars.globals.get(name,
-                   closure_vars.builtins.get(name, None)))
+    table = name_table(function)
+    value = table.nonlocal_value(name)
+    if value is None and name in function.__code__.co_names:
+        value = table.builtins.get(name, None)
+    return value
+
+def make_cell(value):
+    return (lambda: value).__closure__[0]
+
+def make_empty_cell():
+    if False: value = None
+    return (lambda: value).__closure__[0]
+
+def make_free_cell(function, name, cls=None):
+    if name == "__class__" and cls is not None: return make_cell(cls)
+    cell = name_table(function).cells.get(name, None)
+    if cell is not None: return cell
+    value = scan_const(function, name)
+    return make_empty_cell() if value is None else make_cell(value)
+
+def make_function(code, function, cls=None):
+    """ Returns the function of code nested in function. The free variables
+        are bound to the cells of function or to the functions and classes
+        nested in function, the other cells are empty because the values of
+        local variables are unknown.
+    """
+    closure = tuple(make_free_cell(function, name, cls)
+                    for name in code.co_freevars)
+    return FunctionType(code, function.__globals__, code.co_name, None,
+                        closure or None)
+
+def make_class(code, function):
+    """ Returns the class of class body code nested in function. The body
+        isn't executed, the class has the nested functions and classes only.
+    """
+    cls = type(code.co_name, (), {})
+    cls.__module__ = function.__globals__.get("__name__", cls.__module__)
+    cls.__qualname__ = getattr(code, "co_qualname", code.co_name)
+    for obj in code.co_consts:
+        if not iscode(obj) or obj.co_name.startswith("<"): continue
+        setattr(cls, obj.co_name, make_const(obj, function, cls))
+    return cls
+
+def make_const(code, function, cls=None):
+    # the class bodies are the only nested code that isn't optimized
+    if code.co_flags & CO_OPTIMIZED: return make_function(code, function, cls)
+    return make_class(code, function)
 
 def scan_const(function, name):
-    # TODO(burlog): this is ugly bad code that should be improved
-    for obj in function.__code__.co_consts:
-        if not iscode(obj): continue
-        if not obj.co_name == name: continue
-        source = getsource(obj)
-        if def_re.search(source):
-            # TODO(burlog): closure, globals, ...
-            try:
-                return FunctionType(obj, function.__globals__.copy())
-            except TypeError: return None
-        if class_re.search(source):
-            ## TODO(burlog): this is really ugly bad code
-            class_dict = {}
-            eval(obj, function.__globals__.copy(), class_dict)
-            return type(name, (), class_dict)
+    objects = name_table(function).consts
+    if name not in objects:
+        # None while the object is made so the cyclic references stay empty
+        objects[name] = None
+        for obj in function.__code__.co_consts:
+            if iscode(obj) and obj.co_name == name:
+                objects[name] = make_const(obj, function)
+                break
+    return objects[name]
 
 def scan_builtins(function, name):
     return builtins.__dict__.get(name, None)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Callgraph with one vertex per function.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+class Vertex(object):
+    """ The function in callgraph. Unlike the nodes of callgraph tree the
+        vertex holds no symbols so the whole graph can be pickled.
+    """
+
+    def __init__(self, node):
+        self.id = node.id
+        self.name = node.name
+        self.qualname = node.qualname
+        self.filename = None if node.is_opaque else node.filename
+        self.lineno = None if node.is_opaque else node.lineno
+        self.invalid = node.invalid
+        self.truncated = node.truncated
+        self.called_at = []
+        self.children = []
+
+    def __eq__(self, other):
+        return self.id == other.id
+
+    def __ne__(self, other):
+        return self.id != other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return "Vertex(name={0}, id={1})".format(self.name, self.id)
+
+class Edge(object):
+    """ The call site of callee in caller.
+    """
+
+    def __init__(self, caller, callee, called_at):
+        self.caller = caller
+        self.callee = callee
+        self.called_at = called_at
+
+    def __repr__(self):
+        return "Edge({0} -> {1} at {2}:{3})"\
+               .format(self.caller.name, self.callee.name, *self.called_at)
+
+class CallGraph(object):
+    """ Callgraph where each function is one vertex and each call site is
+        one edge.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.vertices = {}
+        self.edges = []
+        self.call_sites = set()
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __iter__(self):
+        yield from self.vertices.values()
+
+    def __getitem__(self, vertex_id):
+        return self.vertices[vertex_id]
+
+    def attach(self, parent, node, where=None):
+        """ Adds vertex for node if it does not exist yet and returns True if
+            the vertex is new. The call site that is already known (the caller
+            is evaluated again) adds no edge.
+        """
+        vertex = self.vertices.get(node.id, None)
+        new = vertex is None
+        if new: vertex = self.vertices[node.id] = Vertex(node)
+        if parent is None:
+            self.root = vertex
+            return new
+        caller = self.vertices[parent.id]
+        call_site = caller.id, vertex.id, where
+        if call_site in self.call_sites: return new
+        self.call_sites.add(call_site)
+        if vertex not in caller.children: caller.children.append(vertex)
+        vertex.called_at.append(where)
+        self.edges.append(Edge(caller, vertex, where))
+        return new
+
+    def callers(self, vertex):
+        for edge in self.edges:
+            if edge.callee is vertex: yield edge.caller
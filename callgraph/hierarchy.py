@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Class hierarchy index of the classes met during build.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from collections import deque
+
+from callgraph.utils import static_attr
+
+class ClassIndex(object):
+    """ The mro of classes, the classes that define their attributes and
+        their subclasses. Everything is computed once per build from the
+        class dicts so no python code of the classes is run.
+    """
+
+    def __init__(self):
+        self.mros = {}
+        self.owners = {}
+        self.subclass_lists = {}
+        self.implementation_lists = {}
+        self.supers = {}
+
+    def clear(self):
+        self.mros.clear()
+        self.owners.clear()
+        self.subclass_lists.clear()
+        self.implementation_lists.clear()
+        self.supers.clear()
+
+    def mro(self, cls):
+        mro = self.mros.get(cls, None)
+        if mro is None:
+            mro = self.mros[cls] = tuple(type.__dict__["__mro__"].__get__(cls))
+        return mro
+
+    def defining_class(self, cls, name):
+        """ Returns the class from mro of class that defines the attribute
+            or None.
+        """
+        key = cls, name
+        if key not in self.owners:
+            self.owners[key] = None
+            for base in self.mro(cls):
+                if name in base.__dict__:
+                    self.owners[key] = base
+                    break
+        return self.owners[key]
+
+    def method_owner(self, cls, function):
+        """ Returns the class from mro of class that defines the function or
+            None.
+        """
+        function = getattr(function, "__func__", function)
+        name = getattr(function, "__name__", None)
+        for base in self.mro(cls):
+            attr = base.__dict__.get(name, None)
+            if getattr(attr, "__func__", attr) is function: return base
+
+    def super_classes(self, cls, function):
+        """ Returns the classes that super() in function can resolve to if
+            self is instance of class: the classes following the class that
+            defines function in mro (the whole mro if function isn't found)
+            without object.
+        """
+        mro = self.mro(cls)
+        owner = self.method_owner(cls, function)
+        start = mro.index(owner) + 1 if owner is not None else 1
+        return tuple(base for base in mro[start:] if base is not object)
+
+    def subclasses(self, cls):
+        """ Returns all subclasses of class in breadth first order.
+        """
+        subclasses = self.subclass_lists.get(cls, None)
+        if subclasses is not None: return subclasses
+        subclasses, seen = [], set()
+        queue = deque(type.__subclasses__(cls))
+        while queue:
+            subclass = queue.popleft()
+            if subclass in seen: continue
+            seen.add(subclass)
+            subclasses.append(subclass)
+            queue.extend(type.__subclasses__(subclass))
+        self.subclass_lists[cls] = subclasses
+        return subclasses
+
+    def implementations(self, cls, name):
+        """ Returns the attribute of class followed by the attributes of its
+            subclasses that override it. The attributes are returned as they
+            are looked up on the classes that define them.
+        """
+        key = cls, name
+        result = self.implementation_lists.get(key, None)
+        if result is not None: return result
+        result = []
+        owner = self.defining_class(cls, name)
+        if owner is not None:
+            result.append(static_attr(owner, name)[1])
+            for subclass in self.subclasses(cls):
+                if self.defining_class(subclass, name) is subclass:
+                    result.append(static_attr(subclass, name)[1])
+        self.implementation_lists[key] = result
+        return result
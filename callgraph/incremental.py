@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Dependencies of callgraph on source files and rebuilds.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import os, sys, time
+from inspect import isclass
+from importlib import reload
+from collections import deque
+
+def file_key(filename):
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def value_filename(value):
+    """ Returns the source file of function or class or None.
+    """
+    value = getattr(value, "__func__", value)
+    code = getattr(value, "__code__", None)
+    if code is not None: return code.co_filename
+    if isclass(value):
+        module = sys.modules.get(getattr(value, "__module__", None), None)
+        return getattr(module, "__file__", None)
+
+def symbol_filenames(symbols):
+    """ Yields the source files of functions and classes held by symbols and
+        by the attributes of instances among them.
+    """
+    queue, seen = deque(symbols), set()
+    while queue:
+        for value_symbol in queue.popleft().values():
+            if id(value_symbol) in seen: continue
+            seen.add(id(value_symbol))
+            filename = value_filename(getattr(value_symbol, "value", None))
+            if filename: yield filename
+            if hasattr(value_symbol, "instance_id"):
+                queue.extend(value_symbol.scope.values())
+
+class Dependencies(object):
+    """ Records which functions were evaluated from which source files and
+        which functions call them. The results of function depend on the
+        results of its callees so the callers of changed function are
+        affected too. The summary of function depends also on the files of
+        functions and classes that it returns, yields or stores.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.filenames = {}
+        self.callers = {}
+        self.keys = {}
+
+    def add(self, parent, node):
+        filename = node.filename
+        self.files.setdefault(filename, set()).add(node.id)
+        self.filenames[node.id] = filename
+        if parent: self.callers.setdefault(node.id, set()).add(parent.id)
+        if filename not in self.keys: self.keys[filename] = file_key(filename)
+
+    def add_references(self, node, filenames):
+        """ Records that the summary of node refers to objects from files.
+        """
+        for filename in filenames:
+            if filename == node.filename: continue
+            self.files.setdefault(filename, set()).add(node.id)
+            if filename not in self.keys:
+                self.keys[filename] = file_key(filename)
+
+    def changed_files(self):
+        return [filename for filename, key in self.keys.items()
+                if file_key(filename) != key]
+
+    def affected(self, filenames):
+        """ Returns ids of functions from files and all their callers. The
+            callees precede their callers (except in cycles), so do the
+            functions whose summaries refer to the files.
+        """
+        starts = [x for filename in filenames
+                  for x in sorted(self.files.get(filename, ()))]
+        # reversed post-order of depth first search from callees to callers
+        result, seen = [], set()
+        for start in starts:
+            if start in seen: continue
+            seen.add(start)
+            stack = [(start, iter(sorted(self.callers.get(start, ()))))]
+            while stack:
+                node_id, callers = stack[-1]
+                for caller in callers:
+                    if caller in seen: continue
+                    seen.add(caller)
+                    stack.append((caller,
+                                  iter(sorted(self.callers.get(caller, ())))))
+                    break
+                else:
+                    stack.pop()
+                    result.append(node_id)
+        result.reverse()
+        return result
+
+    def affected_files(self, filenames):
+        """ Returns the files and files of the affected callers.
+        """
+        result = list(filenames)
+        for node_id in self.affected(filenames):
+            filename = self.filenames[node_id]
+            if filename not in result: result.append(filename)
+        return result
+
+    def refresh(self, filenames):
+        for filename in filenames:
+            self.files.pop(filename, None)
+            self.keys[filename] = file_key(filename)
+
+    def clear(self):
+        self.files.clear()
+        self.filenames.clear()
+        self.callers.clear()
+        self.keys.clear()
+
+def reload_modules(filenames):
+    """ Reloads the imported modules loaded from files in the order of files.
+    """
+    modules = {}
+    for module in list(sys.modules.values()):
+        filename = getattr(module, "__file__", None)
+        if filename: modules[os.path.realpath(filename)] = module
+    for filename in filenames:
+        module = modules.get(os.path.realpath(filename), None)
+        if module is not None: reload(module)
+
+def resolve_again(function):
+    """ Returns the function of the same name from its (reloaded) module or
+        the function itself if it isn't reachable from the module.
+    """
+    obj = sys.modules.get(function.__module__, None)
+    for name in function.__qualname__.split("."):
+        obj = getattr(obj, name, None)
+    return obj if callable(obj) else function
+
+# the summaries keyed by argument symbols never hit in the next build
+incremental_precisions = ("type", "code")
+
+def watch(builder, function, kwargs={}, interval=1.0, reload=True):
+    """ Yields the callgraph of function and then yields it again each time
+        some of its source files changes. Only the summaries of affected
+        functions are dropped so the rest of graph is rebuilt from them. The
+        changed modules and the modules of the affected callers are reloaded
+        so the callers bind the new functions, the summaries and binding
+        plans of the old code of reloaded modules are dropped. The builder
+        has to use the
+        "type" or "code" summary precision, otherwise each rebuild is full.
+    """
+    if builder.summaries.precision not in incremental_precisions:
+        raise ValueError("Incremental rebuilds need summary precision"
+                         " \"type\" or \"code\", not: "
+                         + str(builder.summaries.precision))
+    yield builder.build(function, kwargs)
+    while True:
+        time.sleep(interval)
+        filenames = builder.dependencies.changed_files()
+        if not filenames: continue
+        if reload:
+            reloaded = builder.dependencies.affected_files(filenames)
+            reload_modules(reloaded)
+            function = resolve_again(function)
+            builder.purge(reloaded)
+        builder.invalidate(filenames)
+        yield builder.build(function, kwargs)
@@ -15,6 +15,12 @@ class IndentState(object):
         self.indentation = indentation
 
 class IndentPrinter(object):
+    """ Prints the arguments indented. The arguments are converted to string
+        only when they are printed so pass the objects not their strings.
+    """
+
+    enabled = True
+
     def __init__(self, indentation=4):
         self.indent_state = IndentState(indentation)
 
@@ -22,6 +28,9 @@ class IndentPrinter(object):
         sys.stdout.write(" " * self.indent_state.current)
         print(*args)
 
+    def format(self, pattern, *args):
+        self(pattern.format(*args))
+
     def __enter__(self):
         self.indent_state.current += self.indent_state.indentation
         return self
@@ -30,12 +39,20 @@ class IndentPrinter(object):
         self.indent_state.current -= self.indent_state.indentation
 
 class NonePrinter(object):
+    """ Prints nothing and formats nothing.
+    """
+
+    enabled = False
+
     def __init__(self, *args, **kwargs):
         pass
 
     def __call__(self, *args):
         pass
 
+    def format(self, pattern, *args):
+        pass
+
     def __enter__(self):
         return self
 
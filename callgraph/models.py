@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Models of the builtin functions and builtin types' methods.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import io, builtins
+from types import CodeType, ModuleType
+from inspect import isclass, getmro
+
+# the types of results of builtin functions, None if the type is unknown
+builtin_results = {}
+
+# the types of results of builtin types' methods keyed by (type, name)
+method_results = {}
+
+builtin_method_types = (type("".strip), type(str.strip), type(str.__add__),
+                        type("".__add__), type(dict.__dict__["fromkeys"]))
+
+def register_builtin(obj, result=None):
+    """ Registers the builtin function and type of its result.
+    """
+    builtin_results[obj] = result
+
+def register_builtins(result, names):
+    for name in names.split():
+        obj = getattr(builtins, name, None)
+        if obj is not None: register_builtin(obj, result)
+
+def register_methods(owner, result, names):
+    """ Registers the methods of builtin type that return the result type.
+    """
+    for name in names.split():
+        method = getattr(owner, name, None)
+        if type(method) in builtin_method_types:
+            method_results[method_key(method)] = result
+
+def method_key(method):
+    """ Returns the class that defines builtin method and the method name.
+    """
+    owner = getattr(method, "__objclass__", None)
+    if owner is None:
+        owner = getattr(method, "__self__", None)
+        if not isclass(owner): owner = type(owner)
+        for cls in getmro(owner):
+            if method.__name__ in cls.__dict__: return cls, method.__name__
+    return owner, method.__name__
+
+def builtin_result(obj):
+    """ Returns tuple (True, type of result) if builtin is registered.
+    """
+    if obj in builtin_results: return True, builtin_results[obj]
+    return False, None
+
+def method_result(obj):
+    """ Returns type of result of builtin type's method or None.
+    """
+    if type(obj) not in builtin_method_types: return None
+    return method_results.get(method_key(obj), None)
+
+register_builtins(bool, "all any callable hasattr isinstance issubclass")
+register_builtins(str, "ascii bin chr format hex input oct repr")
+register_builtins(int, "hash id len ord")
+register_builtins(list, "dir sorted")
+register_builtins(dict, "globals locals vars")
+register_builtins(tuple, "divmod")
+register_builtins(CodeType, "compile")
+register_builtins(ModuleType, "__import__")
+register_builtins(io.TextIOWrapper, "open")
+register_builtins(None, "abs aiter anext breakpoint delattr eval exec getattr"
+                        " iter max min next pow print round setattr sum")
+
+register_methods(str, str, "capitalize casefold center expandtabs format"
+                           " format_map join ljust lower lstrip removeprefix"
+                           " removesuffix replace rjust rstrip strip swapcase"
+                           " title translate upper zfill __add__ __mul__"
+                           " __mod__ __getitem__")
+register_methods(str, int, "count find index rfind rindex __len__")
+register_methods(str, bool, "endswith isalnum isalpha isascii isdecimal"
+                            " isdigit isidentifier islower isnumeric"
+                            " isprintable isspace istitle isupper startswith"
+                            " __contains__")
+register_methods(str, list, "split rsplit splitlines")
+register_methods(str, tuple, "partition rpartition")
+register_methods(str, bytes, "encode")
+register_methods(str, dict, "maketrans")
+
+register_methods(bytes, bytes, "capitalize center expandtabs join ljust lower"
+                               " lstrip removeprefix removesuffix replace"
+                               " rjust rstrip strip swapcase title translate"
+                               " upper zfill __add__ __mul__ __mod__")
+register_methods(bytes, int, "count find index rfind rindex __len__")
+register_methods(bytes, bool, "endswith isalnum isalpha isascii isdigit"
+                              " islower isspace istitle isupper startswith"
+                              " __contains__")
+register_methods(bytes, list, "split rsplit splitlines")
+register_methods(bytes, tuple, "partition rpartition")
+register_methods(bytes, str, "decode hex")
+
+register_methods(list, list, "copy __add__ __mul__")
+register_methods(list, int, "count index __len__")
+register_methods(list, bool, "__contains__")
+
+register_methods(tuple, tuple, "__add__ __mul__")
+register_methods(tuple, int, "count index __len__")
+register_methods(tuple, bool, "__contains__")
+
+register_methods(dict, dict, "copy fromkeys")
+register_methods(dict, type({}.keys()), "keys")
+register_methods(dict, type({}.values()), "values")
+register_methods(dict, type({}.items()), "items")
+register_methods(dict, int, "__len__")
+register_methods(dict, bool, "__contains__")
+
+for owner in set, frozenset:
+    register_methods(owner, owner, "copy difference intersection"
+                                   " symmetric_difference union __and__"
+                                   " __or__ __sub__ __xor__")
+    register_methods(owner, bool, "isdisjoint issubset issuperset"
+                                  " __contains__")
+    register_methods(owner, int, "__len__")
+
+register_methods(int, int, "bit_length conjugate __abs__ __add__ __and__"
+                           " __floordiv__ __invert__ __lshift__ __mod__"
+                           " __mul__ __neg__ __or__ __pos__ __rshift__"
+                           " __sub__ __xor__")
+register_methods(int, bytes, "to_bytes")
+register_methods(int, tuple, "as_integer_ratio")
+register_methods(float, float, "conjugate __abs__ __add__ __mul__ __neg__"
+                               " __sub__ __truediv__")
+register_methods(float, str, "hex")
+register_methods(float, bool, "is_integer")
+register_methods(float, tuple, "as_integer_ratio")
+
+register_methods(io.TextIOWrapper, io.TextIOWrapper, "__enter__")
+register_methods(io.TextIOWrapper, str, "read readline")
+register_methods(io.TextIOWrapper, list, "readlines")
+register_methods(io.TextIOWrapper, int, "write fileno seek tell")
+register_methods(io.TextIOWrapper, bool, "readable writable seekable isatty")
@@ -9,9 +9,13 @@
 
 from cached_property import cached_property
 from operator import attrgetter
+from types import MappingProxyType
+from collections import namedtuple
 
 from callgraph.code import make_code
 
+CallEdge = namedtuple("CallEdge", "caller callee called_at recursive")
+
 class NodePath(object):
     def __init__(self, leaf):
         self.leaf = leaf
@@ -29,27 +33,56 @@ class NodePath(object):
                 return True
         return False
 
+# shared empty collections, nodes make own ones on first append
+empty_list = ()
+empty_index = MappingProxyType({})
+
+def intern_key(keys, node_id):
+    """ Returns the one string object used as key by all nodes of the id. The
+        keys table belongs to the builder and is cleared on each build, the
+        ids of lambdas carry addresses and those of invalid nodes are unique
+        so a table shared by all builds would grow without bound.
+    """
+    return keys.setdefault(node_id, node_id)
+
 class Node(object):
-    def __init__(self, symbol, invalid=False):
+    __slots__ = ("root", "parent", "children", "child_index",
+                 "recur_children", "invalid", "truncated", "called_at",
+                 "symbol", "code", "key", "ast_locals")
+
+    def __init__(self, symbol, keys, invalid=False):
         self.root = None
         self.parent = None
-        self.children = []
-        self.recur_children = []
+        self.children = empty_list
+        self.child_index = empty_index
+        self.recur_children = empty_list
         self.invalid = invalid
+        self.truncated = None
         self.called_at = []
         self.symbol = symbol
         self.code = make_code(None if invalid else symbol.value)
+        self.key = intern_key(keys, self.id)
+        self.ast_locals = empty_index
 
     def __eq__(self, other):
-        return self.id == other.id
+        return self.key == other.key
 
     def __ne__(self, other):
-        return self.id != other.id
+        return self.key != other.key
+
+    def __hash__(self):
+        return hash(self.key)
 
     @property
     def cls_name(self):
         return self.__class__.__name__
 
+    def own_ast_locals(self):
+        """ Returns the state of ast nodes kept during evaluation of node.
+        """
+        if self.ast_locals is empty_index: self.ast_locals = {}
+        return self.ast_locals
+
     @property
     def id(self):
         return self.code.id
@@ -89,25 +122,38 @@ class Node(object):
     def source_line(self, fun_lineno=None, file_lineno=None):
         if fun_lineno is None and file_lineno is None:
             raise ValueError("The fun_lineno and file_lineno are both None")
-        lineno = file_lineno - self.lineno if fun_lineno is None else fun_lineno
-        return self.code.source_line(lineno)
+        if file_lineno is None: file_lineno = self.lineno + fun_lineno
+        return self.code.source_line(file_lineno)
 
-    def attach(self, child, where=None):
-        # handle recurrent calls
+    def find_ancestor(self, node):
         for ancestor in self.path_to_root():
-            if child == ancestor:
-                if child not in self.recur_children:
-                    self.recur_children.append(ancestor)
-                ancestor.mark_called_at(where)
-                return False
+            if ancestor == node: return ancestor
+
+    def attach(self, child, where=None, path=None):
+        """ Attaches child and returns True if the child should be evaluated.
+            The path is optional mapping from keys to nodes on the path from
+            root to this node, it is searched otherwise.
+        """
+        # handle recurrent calls
+        if path is None: ancestor = self.find_ancestor(child)
+        else: ancestor = path.get(child.key, None)
+        if ancestor is not None:
+            if child not in self.recur_children:
+                if self.recur_children is empty_list:
+                    self.recur_children = []
+                self.recur_children.append(ancestor)
+            ancestor.mark_called_at(where)
+            return False
 
         # don't attach same child twice but share children between nodes
-        for my_child in self.children:
-            if my_child == child:
-                child.children = my_child.children
-                my_child.mark_called_at(where)
-                break
-        else: self.children.append(child)
+        my_child = self.child_index.get(child.key, None)
+        if my_child is not None:
+            child.children = my_child.own_children()
+            child.child_index = my_child.child_index
+            my_child.mark_called_at(where)
+        else:
+            self.own_children().append(child)
+            self.child_index[child.key] = child
 
         # update nodes 
         child.root = self.root
@@ -115,6 +161,11 @@ class Node(object):
         child.mark_called_at(where)
         return True
 
+    def own_children(self):
+        if self.children is empty_list:
+            self.children, self.child_index = [], {}
+        return self.children
+
     def mark_called_at(self, where):
         self.called_at.append(where)
 
@@ -127,8 +178,10 @@ class Node(object):
                .format(self.cls_name, self.name, self.id, aux)
 
 class InvalidNode(Node):
-    def __init__(self, symbol):
-        super().__init__(symbol, invalid=True)
+    __slots__ = ()
+
+    def __init__(self, symbol, keys):
+        super().__init__(symbol, keys, invalid=True)
         self.symbol = symbol
 
     @property
@@ -147,8 +200,8 @@ class InvalidNode(Node):
     def is_opaque(self):
         return True
 
-def make_node(symbol):
+def make_node(symbol, keys):
     if symbol and symbol.iscallable():
-        return Node(symbol)
-    return InvalidNode(symbol)
+        return Node(symbol, keys)
+    return InvalidNode(symbol, keys)
 
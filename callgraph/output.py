@@ -7,7 +7,35 @@
 # AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
 #
 
+from callgraph.graph import CallGraph
+
+def make_label(call_node):
+    def call_places(places):
+        return map(lambda f: f[0] + ":" + str(f[1]), places)
+    return "{0}|{1}"\
+           .format(call_node.qualname,
+                   "|".join(call_places(call_node.called_at)))
+
+def make_graphviz_graph(graph):
+    from graphviz import Digraph
+    from hashlib import md5
+    dot = Digraph(comment="Callgraph of the <{0}>".format(graph.root.name))
+
+    # node id generator
+    def generate_id(vertex):
+        return md5(vertex.id.encode("utf-8")).hexdigest()
+
+    # one graphviz node per function and one edge per call site
+    for vertex in graph:
+        shape = "triangle" if vertex.invalid else "record"
+        dot.node(generate_id(vertex), label=make_label(vertex), shape=shape)
+    for edge in graph.edges:
+        dot.edge(generate_id(edge.caller), generate_id(edge.callee),
+                 label=str(edge.called_at[1]))
+    return dot
+
 def make_graphviz_tree(root):
+    if isinstance(root, CallGraph): return make_graphviz_graph(root)
     from graphviz import Digraph
     from hashlib import md5
     from operator import attrgetter
@@ -19,14 +47,6 @@ def make_graphviz_tree(root):
         ids = map(attrgetter("id"), node_ids)
         return md5(".".join(ids).encode("utf-8")).hexdigest()
 
-    # make nice label with info where is function called
-    def make_label(call_node):
-        def call_places(places):
-            return map(lambda f: f[0] + ":" + str(f[1]), places)
-        return "{0}|{1}"\
-               .format(call_node.qualname,
-                       "|".join(call_places(call_node.called_at)))
-
     # tree construction function
     def make_nodes(call_node):
         node_id = generate_id(call_node.path_to_root())
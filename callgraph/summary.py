@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Memoized results of function evaluations.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from inspect import isclass
+from collections import OrderedDict
+
+from callgraph.symbols import ConstantSymbol, can_store
+
+class Summary(object):
+    """ The callees discovered during evaluation of function, the symbols
+        that the function can return or yield and the attributes that
+        function stores into its arguments.
+    """
+
+    def __init__(self, bound):
+        self.callees = []
+        self.returns = []
+        self.yields = []
+        self.stores = []
+        # the arguments can be multi symbols that store into their values
+        self.var_names = [[(value, set(value.var_names))
+                           for value in symbol.values()]
+                          for _, symbol in bound]
+
+    def add_callee(self, callee, args, kwargs, lineno):
+        self.callees.append((callee, list(args), dict(kwargs), lineno))
+
+    def finish(self, symbol, bound, returns, yields):
+        self.returns = symbol.return_list[returns:]
+        self.yields = symbol.yield_list[yields:]
+        for (name, _), values in zip(bound, self.var_names):
+            for value, names in values:
+                for attr in value.var_names - names:
+                    self.stores.append((name, attr, value.scope[attr]))
+        del self.var_names
+
+    def symbols(self):
+        """ Yields the symbols that the summary refers to: the returns, the
+            yields, the stored values and the arguments of callees.
+        """
+        yield from self.returns
+        yield from self.yields
+        for _, _, value in self.stores: yield value
+        for _, args, kwargs, _ in self.callees:
+            yield from args
+            yield from kwargs.values()
+
+    def replay_stores(self, bound):
+        bound = dict(bound)
+        for name, attr, value in self.stores:
+            # the argument of this call can be constant even if it wasn't
+            # when summary was made
+            if name in bound and can_store(bound[name]):
+                bound[name].set(attr, value)
+
+class SummaryCache(object):
+    """ Summaries of evaluated functions keyed by the code of function and an
+        abstraction of the bound arguments. The precision says how the
+        arguments are abstracted:
+            None       - summaries are disabled,
+            "identity" - the same argument symbols,
+            "type"     - the same values or types of constants and the
+                         instances of the same attributes,
+            "code"     - arguments are ignored.
+        If limit is given the least recently used summaries are dropped when
+        there is more of them.
+    """
+
+    precisions = (None, "identity", "type", "code")
+
+    def __init__(self, precision=None, limit=None):
+        if precision not in self.precisions:
+            raise ValueError("Unknown summary precision: " + str(precision))
+        self.precision = precision
+        self.limit = limit
+        self.summaries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __bool__(self):
+        return self.precision is not None
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def make_key(self, node, bound):
+        if self.precision == "code": return node.code.code
+        if self.precision == "identity":
+            abstract = lambda symbol: symbol
+        else: abstract = self.abstract_type
+        args = tuple((name, abstract(symbol)) for name, symbol in bound)
+        return node.code.code, args
+
+    def abstract_type(self, symbol, nested=False):
+        def abstract_value(value_symbol):
+            if hasattr(value_symbol, "instance_id"):
+                # the instances differ by their attributes, the nested ones
+                # by identity so the cycles of instances don't matter
+                if nested: return value_symbol.__class__, value_symbol
+                attrs = frozenset((name, self.abstract_type(attr, True))
+                                  for name, attr in value_symbol.scope.items())
+                return value_symbol.__class__, value_symbol.value, attrs
+            value = getattr(value_symbol, "value", None)
+            if isinstance(value_symbol, ConstantSymbol) and not isclass(value):
+                value = type(value)
+            try:
+                hash(value)
+            except TypeError: value = type(value)
+            return value_symbol.__class__, value
+        return frozenset(map(abstract_value, symbol.values()))
+
+    def find(self, key):
+        if key not in self.summaries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.limit: self.summaries.move_to_end(key)
+        return self.summaries[key]
+
+    def store(self, key, summary):
+        self.summaries[key] = summary
+        if self.limit and len(self.summaries) > self.limit:
+            self.summaries.popitem(last=False)
+
+    def invalidate(self, ids):
+        """ Drops the summaries of functions with given ids.
+        """
+        ids = set(ids)
+        for key in list(self.summaries):
+            code = key if self.precision == "code" else key[0]
+            if "{0}:{1}".format(code.co_filename, code.co_firstlineno) in ids:
+                del self.summaries[key]
+
+    def purge(self, filenames):
+        """ Drops the summaries of functions from files.
+        """
+        filenames = set(filenames)
+        for key in list(self.summaries):
+            code = key if self.precision == "code" else key[0]
+            if code.co_filename in filenames: del self.summaries[key]
+
+    def clear(self):
+        self.summaries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self.summaries), "precision": self.precision}
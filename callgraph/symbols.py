@@ -7,23 +7,75 @@
 # AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
 #
 
-import os
+from types import MappingProxyType
 from itertools import chain, islice
-from inspect import isclass, isbuiltin, getmro
+from inspect import isclass, isbuiltin
 from abc import ABCMeta, abstractmethod
 
 from callgraph.finder import find_object
-from callgraph.utils import empty
+from callgraph.models import builtin_result, method_result
+from callgraph.utils import empty, class_names, static_attr
+
+# shared empty collections, symbols make own ones on first write
+empty_scope = MappingProxyType({})
+empty_names = frozenset()
+empty_list = ()
+
+class SymbolList(list):
+    """ Insertion ordered list of symbols where each symbol is at most once.
+        The symbols are compared by identity, the set of ids is made when
+        the second symbol is appended.
+    """
+
+    __slots__ = ("ids",)
+
+    def __init__(self, symbols=()):
+        super().__init__()
+        self.ids = None
+        self.extend(symbols)
+
+    def append(self, symbol):
+        if not self: return super().append(symbol)
+        if self.ids is None: self.ids = set(map(id, self))
+        if id(symbol) not in self.ids:
+            self.ids.add(id(symbol))
+            super().append(symbol)
+
+    def extend(self, symbols):
+        for symbol in symbols: self.append(symbol)
+
+class ValueSet(object):
+    """ Set of the symbols' values, the unhashable values are compared one
+        by one.
+    """
+
+    def __init__(self):
+        self.values = set()
+        self.unhashable = []
+
+    def add(self, value):
+        """ Adds value and returns True if it wasn't in set yet.
+        """
+        try:
+            if value in self.values: return False
+            self.values.add(value)
+        except TypeError:
+            if value in self.unhashable: return False
+            self.unhashable.append(value)
+        return True
 
 class Symbol(metaclass=ABCMeta):
+    __slots__ = ("builder", "name", "scope", "return_list", "yield_list",
+                 "myself", "var_names")
+
     def __init__(self, builder, name):
         self.builder = builder
         self.name = name
-        self.scope = {}
-        self.return_list = []
-        self.yield_list = []
+        self.scope = empty_scope
+        self.return_list = empty_list
+        self.yield_list = empty_list
         self.myself = None
-        self.var_names = set()
+        self.var_names = empty_names
 
     @abstractmethod
     def values(self):
@@ -69,23 +121,35 @@ class Symbol(metaclass=ABCMeta):
         return any(map(lambda x: callable(x.value), self.values()))
 
     def isiterable(self):
-        return "__iter__" in dir(self)
+        return "__iter__" in class_names(self.__class__)
 
     def ismapping(self):
-        return "__iter_items__" in dir(self)
+        return "__iter_items__" in class_names(self.__class__)
 
     def __bool__(self):
         return True
 
+    def own_scope(self):
+        if self.scope is empty_scope: self.scope = {}
+        return self.scope
+
+    def add_returns(self, symbols):
+        if self.return_list is empty_list: self.return_list = SymbolList()
+        self.return_list.extend(symbols)
+
+    def add_yields(self, symbols):
+        if self.yield_list is empty_list: self.yield_list = SymbolList()
+        self.yield_list.extend(symbols)
+
     def can_return(self, symbol):
-        self.return_list.extend(symbol.values())
-        self.yield_list.extend(symbol.geners())
+        self.add_returns(symbol.values())
+        self.add_yields(symbol.geners())
 
     def can_yield(self, symbol):
-        self.yield_list.extend(symbol.values())
+        self.add_yields(symbol.values())
 
     def can_yield_from(self, symbol):
-        self.yield_list.extend(symbol.geners())
+        self.add_yields(symbol.geners())
 
     def __repr__(self):
         aux = ", ".join(self.aux_repr())
@@ -101,12 +165,15 @@ class Symbol(metaclass=ABCMeta):
         return "{0}(name={1}{2})".format(self.cls_name, self.name, aux)
 
 class UnarySymbol(Symbol):
+    __slots__ = ("force_myself", "class_scope", "value", "counter",
+                 "instance_id")
+
     def __init__(self, builder, name, value):
         super().__init__(builder, name)
-        UnarySymbol.counter = 0
         self.force_myself = None
-        self.class_scope = {}
+        self.class_scope = empty_scope
         self.value = value
+        self.counter = 0
 
     @property
     def qualname(self):
@@ -121,10 +188,12 @@ class UnarySymbol(Symbol):
         if name in self.class_scope: return self.class_scope[name]
 
         # attributes of the held value
-        if hasattr(self.value, name):
-            symbol = UnarySymbol(self.builder, name, getattr(self.value, name))
-            symbol.myself = self.force_myself or self
-            return self.scope.setdefault(name, symbol)
+        found, value = static_attr(self.value, name)
+        if found:
+            symbol = self.make_attr(name, value)
+            if self.builder.overrides and hasattr(self, "instance_id"):
+                symbol = self.add_overrides(name, symbol)
+            return self.own_scope().setdefault(name, symbol)
 
         # global symbols if they are allowed
         if not free: return
@@ -135,7 +204,27 @@ class UnarySymbol(Symbol):
         kwargs = {}
         if hasattr(symbol, "value"): kwargs["value"] = symbol.value
         self.hooks.global_symbol_load(name=symbol.name, **kwargs)
-        return self.scope.setdefault(name, symbol)
+        return self.own_scope().setdefault(name, symbol)
+
+    def make_attr(self, name, value):
+        symbol = UnarySymbol(self.builder, name, value)
+        symbol.myself = self.force_myself or self
+        result = method_result(value)
+        if result is not None:
+            symbol.can_return(UnarySymbol(self.builder, "__result__", result))
+        return symbol
+
+    def add_overrides(self, name, symbol):
+        """ Returns the attribute symbol merged with the implementations of
+            attribute in subclasses because the instance can be instance of
+            any subclass at runtime.
+        """
+        implementations = self.builder.classes.implementations(self.value,
+                                                               name)
+        if len(implementations) < 2: return symbol
+        symbols = [symbol] + [self.make_attr(name, value)
+                              for value in implementations[1:]]
+        return MultiSymbol(self.builder, name, symbols)
 
     def set(self, name, value):
         assert isinstance(value, Symbol)
@@ -143,17 +232,13 @@ class UnarySymbol(Symbol):
             if name in self.scope:
                 self.scope[name] = merge_symbols(name, self.scope[name], value)
             else:
-                self.scope[name] = value
+                self.own_scope()[name] = value
+                if self.var_names is empty_names: self.var_names = set()
                 self.var_names.add(name)
 
     def make_instance(self):
         instance_symbol = UnarySymbol(self.builder, self.name, self.value)
-        instance_symbol.class_scope = self.scope
-        instance_symbol.scope = {}
-        instance_symbol.return_list = []
-        instance_symbol.yield_list = []
-        instance_symbol.myself = None
-        instance_symbol.var_names = set()
+        instance_symbol.class_scope = self.own_scope()
         self.counter += 1
         instance_symbol.instance_id = self.counter
         return instance_symbol
@@ -179,6 +264,8 @@ class UnarySymbol(Symbol):
         yield "value=" + repr(self.value)
 
 class ConstantSymbol(UnarySymbol):
+    __slots__ = ()
+
     def __init__(self, builder, value):
         super().__init__(builder, type(value).__name__, value)
 
@@ -186,6 +273,8 @@ class ConstantSymbol(UnarySymbol):
         raise RuntimeError("Invalid assingment into constant symbol")
 
 class IterableConstantSymbol(ConstantSymbol):
+    __slots__ = ("iterable",)
+
     def __init__(self, builder, cls, iterable):
         super().__init__(builder, cls)
         self.iterable = iterable
@@ -199,6 +288,8 @@ class IterableConstantSymbol(ConstantSymbol):
               .format(",".join(map(lambda x: x.inst_name, self.iterable)))
 
 class MappingConstantSymbol(IterableConstantSymbol):
+    __slots__ = ("iterable_values",)
+
     def __init__(self, builder, cls, keys, values):
         super().__init__(builder, cls, keys)
         self.iterable_values = values
@@ -207,6 +298,8 @@ class MappingConstantSymbol(IterableConstantSymbol):
         yield from zip(self.iterable, self.iterable_values)
 
 class InvalidSymbol(Symbol):
+    __slots__ = ()
+
     def __init__(self, builder, name):
         super().__init__(builder, name)
 
@@ -226,6 +319,8 @@ class InvalidSymbol(Symbol):
         while False: yield self
 
 class LambdaSymbol(Symbol):
+    __slots__ = ("args", "value")
+
     def __init__(self, builder, args, body):
         super().__init__(builder, "__lambda__")
         self.args = args
@@ -248,10 +343,12 @@ class LambdaSymbol(Symbol):
         while True: yield self
 
 class MultiSymbol(Symbol):
+    __slots__ = ("value_list", "gener_list")
+
     def __init__(self, builder, name, value_list=[], gener_list=[]):
         super().__init__(builder, name)
-        self.value_list = list(value_list)
-        self.gener_list = list(gener_list)
+        self.value_list = SymbolList(value_list)
+        self.gener_list = SymbolList(gener_list) or empty_list
 
     @property
     def qualname(self):
@@ -274,23 +371,21 @@ class MultiSymbol(Symbol):
             yield from value.yields()
 
     def get(self, name, free=True):
-        def list_values(attr_symbol):
-            yield from iter(x.value for x in attr_symbol.value_list)
         attr_symbol = MultiSymbol(self.builder, name)
+        attr_values = ValueSet()
         for symbol in filter(None, self.values()):
             assert not isinstance(symbol, MultiSymbol)
             attr = symbol.get(name, free)
             if not attr: continue
             for sub_attr in attr.values():
-                if sub_attr.value not in list_values(attr_symbol):
+                if attr_values.add(sub_attr.value):
                     attr_symbol.value_list.append(sub_attr)
         return attr_symbol
 
     def set(self, name, value):
         assert isinstance(value, Symbol)
         for symbol in filter(None, self.values()):
-            if not isinstance(symbol, ConstantSymbol):
-                symbol.set(name, value)
+            if can_store(symbol): symbol.set(name, value)
 
     def aux_repr(self):
         names = lambda s: map(lambda x: x.inst_name, s)
@@ -331,6 +426,8 @@ class MultiSymbol(Symbol):
         return any(map(lambda x: x.ismapping(), self.values()))
 
 class ResultSymbol(MultiSymbol):
+    __slots__ = ()
+
     def __init__(self, builder, callee_symbol):
         super().__init__(builder,
                          "__result_of_" + callee_symbol.inst_name + "__",
@@ -338,8 +435,19 @@ class ResultSymbol(MultiSymbol):
                          callee_symbol.yields())
 
 class BuiltinSymbol(UnarySymbol):
-    def __init__(self, builder, obj):
+    """ The builtin function, one per builder. Each call gets own symbol of
+        result so the attributes stored into the result of one call aren't
+        seen by the others.
+    """
+    __slots__ = ("result",)
+
+    def __init__(self, builder, obj, result=None):
         super().__init__(builder, obj.__name__, obj)
+        self.result = result
+
+    def returns(self):
+        if self.result is not None:
+            yield UnarySymbol(self.builder, "__result__", self.result)
 
     def set(self, name, value):
         raise RuntimeError("You can't assing attribute to builtin symbol")
@@ -355,91 +463,22 @@ class SuperBuiltinSymbol(MultiSymbol):
                          self.make_super(parent))
 
     def make_super(self, parent):
-        __super__ = UnarySymbol(parent.builder, "__super__", super.__init__)
-        for cls in getmro(parent.myself.value)[1:-1]:
-            symbol = UnarySymbol(parent.builder, cls.__name__, cls)
-            symbol.force_myself = parent.myself
-            __super__.can_return(symbol)
-        return [__super__]
+        # one __super__ per instance and function, myself keeps its id valid
+        classes = parent.builder.classes
+        key = id(parent.myself), parent.value
+        if key not in classes.supers:
+            __super__ = UnarySymbol(parent.builder, "__super__", super.__init__)
+            bases = classes.super_classes(parent.myself.value, parent.value)
+            for cls in bases:
+                symbol = UnarySymbol(parent.builder, cls.__name__, cls)
+                symbol.force_myself = parent.myself
+                __super__.can_return(symbol)
+            classes.supers[key] = parent.myself, __super__
+        return [classes.supers[key][1]]
 
     def set(self, name, value):
         raise RuntimeError("You can't assing attribute to builtin symbol")
 
-class OpenResultBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder, obj):
-        super().__init__(builder, obj.__class__)
-        self.get("__enter__").can_return(self)
-
-class OpenBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, open)
-        self.can_return(OpenResultBuiltinSymbol(builder, open(os.devnull, "r")))
-
-class DirBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, dir)
-        self.can_return(UnarySymbol(builder, "__result__", type(dir())))
-
-class GetattrBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, getattr)
-        # TODO(burlog): we can add default to returns
-        # TODO(burlog): we inspect static objects and add to returns...
-
-class IsinstanceBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, isinstance)
-        self.can_return(UnarySymbol(builder, "__result__", bool))
-
-class PrintBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, print)
-
-class CallableBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, callable)
-        self.can_return(UnarySymbol(builder, "__result__", bool))
-
-class IdBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, id)
-        self.can_return(UnarySymbol(builder, "__result__", type(id(""))))
-
-class HasattrBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, hasattr)
-        self.can_return(UnarySymbol(builder, "__result__", bool))
-
-class IterBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, iter)
-        # TODO(burlog): we can guess types...
-
-class LenBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, len)
-        self.can_return(UnarySymbol(builder, "__result__", int))
-
-class OrdBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, ord)
-        self.can_return(UnarySymbol(builder, "__result__", int))
-
-class MinBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, min)
-        self.can_return(UnarySymbol(builder, "__result__", min))
-
-class MaxBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, max)
-        self.can_return(UnarySymbol(builder, "__result__", max))
-
-class NextBuiltinSymbol(BuiltinSymbol):
-    def __init__(self, builder):
-        super().__init__(builder, next)
-        # TODO(burlog): we can guess types...
-
 def make_result_symbol(builder, callee_symbol):
     def expand_ctors(origin_symbol):
         for symbol in origin_symbol.values():
@@ -452,6 +491,13 @@ def make_result_symbol(builder, callee_symbol):
     return ResultSymbol(builder, result_symbol)\
         or InvalidSymbol(builder, "__result__")
 
+def can_store(symbol):
+    """ Returns True if attributes can be stored into symbol, the constants,
+        builtins and invalid symbols raise on store.
+    """
+    return not isinstance(symbol, (ConstantSymbol, InvalidSymbol,
+                                   BuiltinSymbol, SuperBuiltinSymbol))
+
 def merge_symbols(name, *args):
     def chain_values(symbols):
         for symbol in symbols:
@@ -459,30 +505,42 @@ def merge_symbols(name, *args):
     def chain_geners(symbols):
         for symbol in symbols:
             yield from symbol.geners()
-    value_list = list(chain_values(args))
-    gener_list = list(chain_geners(args))
+    value_list = chain_values(args)
+    gener_list = chain_geners(args)
     return MultiSymbol(args[0].builder, name, value_list, gener_list)
 
+def make_constant(builder, value):
+    """ Returns the constant symbol of value. The symbols of hashable values
+        are interned so each builder has one symbol per value.
+    """
+    try:
+        key = type(value), value
+        symbol = builder.constants.get(key, None)
+    except TypeError:
+        return ConstantSymbol(builder, value)
+    if symbol is None:
+        symbol = builder.constants[key] = ConstantSymbol(builder, value)
+    return symbol
+
+def make_builtin(builder, obj):
+    """ Returns the symbol of registered builtin function, one per builder,
+        or None if the builtin isn't registered.
+    """
+    symbol = builder.builtins.get(obj, None)
+    if symbol is None:
+        registered, result = builtin_result(obj)
+        if not registered: return None
+        symbol = builder.builtins[obj] = BuiltinSymbol(builder, obj, result)
+    return symbol
+
 def find_symbol(parent, value, name):
-    obj = find_object(value.__init__ if isclass(value) else value, name)
+    obj = parent.builder.names.find(value, name)
+    if obj is None:
+        obj = find_object(value.__init__ if isclass(value) else value, name)
     if obj is None: return InvalidSymbol(parent.builder, name)
     if isbuiltin(obj) and not isclass(obj):
-        if obj == open: return OpenBuiltinSymbol(parent.builder)
-        if obj == dir: return DirBuiltinSymbol(parent.builder)
-        if obj == getattr: return GetattrBuiltinSymbol(parent.builder)
-        if obj == hasattr: return HasattrBuiltinSymbol(parent.builder)
-        if obj == isinstance: return IsinstanceBuiltinSymbol(parent.builder)
-        if obj == print: return PrintBuiltinSymbol(parent.builder)
-        if obj == callable: return CallableBuiltinSymbol(parent.builder)
-        if obj == id: return IdBuiltinSymbol(parent.builder)
-        if obj == iter: return IterBuiltinSymbol(parent.builder)
-        if obj == len: return LenBuiltinSymbol(parent.builder)
-        if obj == ord: return OrdBuiltinSymbol(parent.builder)
-        if obj == min: return MinBuiltinSymbol(parent.builder)
-        if obj == max: return MaxBuiltinSymbol(parent.builder)
-        if obj == next: return NextBuiltinSymbol(parent.builder)
-        return InvalidSymbol(parent.builder, name)
-        #raise NotImplementedError("Unknown builtin symbol: " + name)
+        return make_builtin(parent.builder, obj)\
+            or InvalidSymbol(parent.builder, name)
     if obj == super: return SuperBuiltinSymbol(parent)
     return UnarySymbol(parent.builder, name, obj)
 
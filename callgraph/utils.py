@@ -8,7 +8,12 @@
 #
 
 import re, ast
+from types import FunctionType, MethodType
+from inspect import isclass
 from itertools import islice
+from functools import partial
+from weakref import WeakKeyDictionary, ref
+from tokenize import open as open_source
 
 indent_re = re.compile("(^[ \t]*)")
 
@@ -26,15 +31,178 @@ def skip_leader(lines):
         leader += 1
     return leader
 
-def getsource(code):
-    if "__code__" in dir(code): code = code.__code__
-    lines = open(code.co_filename).readlines()
-    lines = list(strip_indent(lines[code.co_firstlineno - 1:]))
+def block_length(lines):
+    lines = list(strip_indent(lines))
     leader = skip_leader(lines)
     for i, line in enumerate(islice(lines, leader, None)):
         if line and line[0] not in " \t\r\n":
-            return "".join(lines[:i + leader])
-    return "".join(lines)
+            return i + leader
+    return len(lines)
+
+class_names_cache = WeakKeyDictionary()
+
+def class_names(cls):
+    """ Returns the names listed by dir() of class, the names are computed
+        once per class.
+    """
+    try:
+        return class_names_cache[cls]
+    except KeyError:
+        names = class_names_cache[cls] = frozenset(dir(cls))
+        return names
+    except TypeError:
+        return frozenset(dir(cls))
+
+def has_name(obj, name):
+    """ Returns the same as name in dir(obj) without listing attributes of
+        obj's class for each object.
+    """
+    if isclass(obj): return name in class_names(obj)
+    cls = type(obj)
+    if cls.__dir__ is not object.__dir__: return name in dir(obj)
+    if name in class_names(cls): return True
+    return name in getattr(obj, "__dict__", ())
+
+# the descriptors implemented in C that don't run python code
+c_descriptors = (type(str.strip), type(str.__add__),
+                 type(dict.__dict__["fromkeys"]),
+                 type(type.__dict__["__basicsize__"]),
+                 type(FunctionType.__dict__["__code__"]))
+
+missing = object()
+
+class_attrs_cache = WeakKeyDictionary()
+
+# how the attribute found in the dict of class is returned
+plain_attr, getter_attr, static_method, class_method = range(4)
+
+def class_attrs(cls):
+    """ Returns dict of tuples (weak reference to the class from mro of class
+        that defines the attribute or None, the kind of attribute, whether
+        it is data descriptor) filled by class_attr. The entries don't hold
+        the attributes because they can refer to the class (e.g. methods
+        calling super() have __class__ cell) that is the weak key of cache.
+        The entries aren't invalidated, attributes set on the class or its
+        bases after the first lookup (e.g. monkeypatching) aren't seen
+        unless they replace the attribute in the class that defines it.
+    """
+    try:
+        return class_attrs_cache[cls]
+    except KeyError:
+        attrs = class_attrs_cache[cls] = {}
+        return attrs
+    except TypeError:
+        return {}
+
+def class_attr(cls, name, attrs=None):
+    """ Returns the tuple (attribute from mro of class or missing, its getter
+        or None, whether it is data descriptor). The getter is set only for
+        functions and descriptors implemented in C so calling it doesn't run
+        python code. The class that defines the attribute is found once per
+        class and name, the attribute is taken from its dict.
+    """
+    if attrs is None: attrs = class_attrs(cls)
+    try:
+        owner, kind, data = attrs[name]
+    except KeyError:
+        owner, kind, data = attrs[name] = make_class_attr(cls, name)
+    if owner is None: return missing, None, False
+    attr = owner().__dict__.get(name, missing)
+    if kind == plain_attr or attr is missing: return attr, None, data
+    if kind == getter_attr: return attr, attr.__get__, data
+    if kind == static_method: return attr.__func__, None, data
+    return attr.__func__, partial(bind_class, attr.__func__), data
+
+def mro_lookup(cls, name):
+    for base in type.__dict__["__mro__"].__get__(cls):
+        if name in base.__dict__: return base.__dict__[name]
+    return missing
+
+def mro_owner(cls, name):
+    for base in type.__dict__["__mro__"].__get__(cls):
+        if name in base.__dict__: return base
+
+def bind_class(function, obj, cls):
+    return MethodType(function, cls)
+
+def make_class_attr(cls, name):
+    owner = mro_owner(cls, name)
+    if owner is None: return None, plain_attr, False
+    attr = owner.__dict__[name]
+    kind = type(attr)
+    data = mro_lookup(kind, "__set__") is not missing\
+        or mro_lookup(kind, "__delete__") is not missing
+    if isinstance(attr, staticmethod): kind = static_method
+    elif isinstance(attr, classmethod): kind = class_method
+    elif kind is FunctionType or kind in c_descriptors: kind = getter_attr
+    else: kind = plain_attr
+    return ref(owner), kind, data
+
+def static_attr(obj, name):
+    """ Returns tuple (True, attribute of obj) or (False, None) like hasattr
+        and getattr do but without invoking properties, __getattr__ or any
+        other python code, see inspect.getattr_static. The descriptors
+        implemented in python are returned as they are.
+    """
+    cls = type(obj)
+    try:
+        if isinstance(obj, type):
+            meta, getter, data = class_attr(cls, name)
+            if data: return True, getter(obj, cls) if getter else meta
+            attr, attr_getter, _ = class_attr(obj, name)
+            if attr is not missing:
+                return True, attr_getter(None, obj) if attr_getter else attr
+            if meta is not missing:
+                return True, getter(obj, cls) if getter else meta
+            return False, None
+
+        attrs = class_attrs(cls)
+        attr, getter, data = class_attr(cls, name, attrs)
+        if data: return True, getter(obj, cls) if getter else attr
+        _, dict_getter, _ = class_attr(cls, "__dict__", attrs)
+        if dict_getter is not None:
+            instance_dict = dict_getter(obj, cls)
+            if name in instance_dict: return True, instance_dict[name]
+        if attr is not missing:
+            return True, getter(obj, cls) if getter else attr
+        # bound methods delegate the other attributes to their functions
+        if cls is MethodType: return static_attr(obj.__func__, name)
+    except AttributeError: pass
+    return False, None
+
+def getsource(code):
+    if has_name(code, "__code__"): code = code.__code__
+    lines = open(code.co_filename).readlines()
+    lines = list(strip_indent(lines[code.co_firstlineno - 1:]))
+    return "".join(lines[:block_length(lines)])
+
+class ModuleSource(object):
+    """ Whole parsed source file with index of all function and class
+        definitions by the line where they start (decorators included).
+    """
+
+    def_types = tuple(getattr(ast, x)
+                      for x in ("FunctionDef", "AsyncFunctionDef", "ClassDef")
+                      if hasattr(ast, x))
+
+    def __init__(self, filename):
+        with open_source(filename) as source_file:
+            self.lines = source_file.readlines()
+        tree = ast.parse("".join(self.lines), filename)
+        self.index = {}
+        for node in ast.walk(tree):
+            if isinstance(node, self.def_types):
+                lines = [x.lineno for x in node.decorator_list]
+                self.index.setdefault(min(lines + [node.lineno]), node)
+
+    def find(self, lineno):
+        return self.index.get(lineno, None)
+
+    def block_lines(self, def_node, lineno):
+        end_lineno = getattr(def_node, "end_lineno", None)
+        if end_lineno is None:
+            end_lineno = lineno - 1 + block_length(self.lines[lineno - 1:])
+        return self.lines[lineno - 1:end_lineno]
 
 class AuPair(object):
     def __init__(self, builder, tot):
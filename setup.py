@@ -15,7 +15,7 @@ setup(name="callgraph",
       description="Build callgraph from statically reacheble code.",
       author="Michal Bukovsky",
       author_email="michal.bukovsky@trilogic.cz",
-      packages=find_packages(exclude=["tests"]),
+      packages=find_packages(exclude=["tests", "benchmarks"]),
       test_suite="tests",
       licence="MIT")
 
@@ -283,6 +283,55 @@ def test_args_fun_default_simple():
     path = ["fun", "fun.fun1", "fun.fun1.strip"]
     assert list(dfs_node_names(root)) == path
 
+def test_args_fun_binding_plan():
+    def fun1(a, b=1, c=""):
+        a.strip()
+        b.bit_length()
+        c.lower()
+
+    def fun():
+        fun1("", c="", d=None)
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.strip", "fun.fun1.bit_length",
+            "fun.fun1.lower"]
+    assert list(dfs_node_names(root)) == path
+    arguments = builder.plans[fun1].bind([], {"c": 1, "a": 2})
+    assert list(arguments) == ["a", "c", "b"]
+
+def test_args_default_stores():
+    class Config(object):
+        pass
+
+    def h1():
+        pass
+
+    def h2():
+        pass
+
+    def fun1(cb, config=Config()):
+        config.handler = cb
+        config.handler()
+
+    def fun2():
+        fun1(h1)
+
+    def fun3():
+        fun1(h2)
+
+    builder = CallGraphBuilder()
+    root2 = builder.build(fun2)
+    root3 = builder.build(fun3)
+
+    assert list(dfs_node_names(root2)) == ["fun2", "fun2.fun1",
+                                           "fun2.fun1.h1"]
+    assert list(dfs_node_names(root3)) == ["fun3", "fun3.fun1",
+                                           "fun3.fun1.h2"]
+
 @pytest.mark.skipif(True, reason="list/tuple subscription")
 def test_args_fun_starargs_self():
     class A:
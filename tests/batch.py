@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for batch builds.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import pytest, pickle
+
+from callgraph.batch import build_batch, resolve_root, CompactTree
+from callgraph.batch import worker_builder, worker_state
+from callgraph.builder import CallGraphBuilder
+from tests.helpers import compact_node_names, dfs_node_names
+from tests.helpers import dfs_vertex_names
+
+# the batch roots have to be importable
+
+def batch_fun1():
+    return ""
+
+def batch_fun2():
+    a = batch_fun1()
+    a.strip()
+
+class BatchClass(object):
+    def method(self):
+        batch_fun2()
+
+def test_batch_resolve_root():
+    assert resolve_root("tests.batch:batch_fun1") is batch_fun1
+    assert resolve_root("tests.batch:BatchClass.method")\
+           is BatchClass.method
+
+def test_batch_compact_tree():
+    builder = CallGraphBuilder()
+    root = builder.build(batch_fun2)
+    tree = pickle.loads(pickle.dumps(CompactTree(root)))
+    assert list(compact_node_names(tree)) == list(dfs_node_names(root))
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_batch_build(workers):
+    roots = ["tests.batch:batch_fun2", "tests.batch:missing",
+             "tests.batch:batch_fun1"]
+    results = dict((x.root, x) for x in build_batch(roots, workers=workers))
+
+    assert sorted(results) == sorted(roots)
+    result = results["tests.batch:batch_fun2"]
+    path = ["batch_fun2", "batch_fun2.batch_fun1", "batch_fun2.strip"]
+    assert result.error is None
+    assert list(compact_node_names(result.result)) == path
+    assert list(compact_node_names(results["tests.batch:batch_fun1"].result))\
+           == ["batch_fun1"]
+    assert results["tests.batch:missing"].result is None
+    assert "AttributeError" in results["tests.batch:missing"].error
+
+def test_batch_worker_builder():
+    builder = worker_builder("batch1", {"silent": True, "priority": len})
+    assert worker_builder("batch1", {"priority": lambda x: x}) is builder
+    assert worker_builder("batch2", {"silent": True}) is not builder
+    worker_state.clear()
+
+def test_batch_worker_caches():
+    roots = ["tests.batch:batch_fun2", "tests.batch:batch_fun1"]
+    results = build_batch(roots, workers=0, summary_precision="code")
+    next(results)
+    builder = worker_state["builder"]
+    assert not builder.constants and not builder.plans
+    assert builder.summaries.limit is not None
+    list(results)
+    assert not worker_state
+
+def test_batch_graph():
+    roots = ["tests.batch:batch_fun2"]
+    results = list(build_batch(roots, workers=1, chunksize=2, graph=True))
+
+    assert len(results) == 1
+    names = ["batch_fun2", "batch_fun1", "strip"]
+    assert list(dfs_vertex_names(results[0].result)) == names
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for build budgets.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import time
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.budget import Budget
+from tests.helpers import dfs_node_names
+
+def test_budget_max_depth():
+    def fun2():
+        "".strip()
+
+    def fun1():
+        fun2()
+
+    def fun():
+        fun1()
+
+    builder = CallGraphBuilder(budget=Budget(max_depth=1))
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.fun2"]
+    assert list(dfs_node_names(root)) == path
+    assert root.children[0].children[0].truncated == "max_depth"
+    report = builder.budget.report
+    assert [(x.name, x.reason) for x in report] == [("fun2", "max_depth")]
+
+def test_budget_max_nodes():
+    def fun():
+        "".strip()
+        "".find()
+        "".lower()
+
+    builder = CallGraphBuilder(budget=Budget(max_nodes=3))
+    root = builder.build(fun)
+
+    path = ["fun", "fun.strip", "fun.find"]
+    assert list(dfs_node_names(root)) == path
+    assert root.truncated == "max_nodes"
+    assert len(builder.budget.report) == 1
+
+    # the budget is renewed for each build
+    root = builder.build(fun)
+    assert list(dfs_node_names(root)) == path
+
+def test_budget_function_time():
+    def fun1():
+        time.sleep(0.01)
+        "".strip()
+
+    def fun():
+        fun1()
+
+    builder = CallGraphBuilder(budget=Budget(function_time=0.0))
+    root = builder.build(fun)
+
+    assert list(dfs_node_names(root)) == ["fun", "fun.fun1", "fun.fun1.sleep"]
+    assert root.children[0].truncated == "function_time"
+
+def test_budget_total_time():
+    def fun():
+        "".strip()
+
+    builder = CallGraphBuilder(budget=Budget(total_time=-1))
+    root = builder.build(fun)
+
+    assert list(dfs_node_names(root)) == ["fun"]
+    assert root.truncated == "total_time"
+
+def test_budget_graph():
+    def fun1():
+        "".strip()
+
+    def fun():
+        fun1()
+
+    builder = CallGraphBuilder(budget=Budget(max_depth=0))
+    graph = builder.build_graph(fun)
+    assert graph[graph.root.children[0].id].truncated == "max_depth"
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for caches of parsed code.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import pytest, gc, os
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.code import make_code
+from callgraph.cache import ASTCache, DiskCache, ast_cache, module_cache
+from tests.helpers import dfs_node_names, depth_first_traverse
+
+def test_cache_shared_ast():
+    def fun1():
+        "".strip()
+
+    def fun2():
+        fun1()
+
+    def fun():
+        fun1()
+        fun2()
+
+    builder = CallGraphBuilder()
+    misses = ast_cache.misses
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.strip", "fun.fun2", "fun.fun2.fun1",
+            "fun.fun2.fun1.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert ast_cache.misses - misses == 3
+    fun1_nodes = [x for x in depth_first_traverse(root) if x.name == "fun1"]
+    assert fun1_nodes[0].ast is fun1_nodes[1].ast
+
+def test_cache_interleaved_builds():
+    def a_only():
+        pass
+
+    def b_only():
+        pass
+
+    def a():
+        return a_only
+
+    def b():
+        return b_only
+
+    def fun(cb):
+        result = cb()
+        result()
+
+    def edges(stream):
+        return [(x.caller.name, x.callee.name) for x in stream if x.caller]
+
+    alone1 = edges(CallGraphBuilder().iter_edges(fun, {"cb": a}))
+    alone2 = edges(CallGraphBuilder().iter_edges(fun, {"cb": b}))
+    stream1 = CallGraphBuilder().iter_edges(fun, {"cb": a})
+    stream2 = CallGraphBuilder().iter_edges(fun, {"cb": b})
+    edges1, edges2 = [], []
+    for edge1, edge2 in zip(stream1, stream2):
+        edges1.append(edge1)
+        edges2.append(edge2)
+    edges1.extend(stream1)
+    edges2.extend(stream2)
+
+    assert edges(edges1) == alone1
+    assert edges(edges2) == alone2
+    assert ("fun", "a_only") not in alone2
+
+def test_cache_rebuild():
+    def fun1():
+        return ""
+
+    def fun():
+        a = fun1()
+        a.strip()
+
+    builder = CallGraphBuilder()
+    builder.build(fun)
+    hits = ast_cache.hits
+    root = builder.build(fun)
+
+    path = ["fun", "fun.fun1", "fun.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert ast_cache.hits - hits == 2
+
+def test_cache_weak_entries():
+    cache = ASTCache()
+    def fun():
+        pass
+    cache.fetch(fun.__code__, lambda: "tree")
+    assert fun.__code__ in cache
+    assert cache.fetch(fun.__code__, lambda: "other") == "tree"
+    stats = {"hits": 1, "misses": 1, "size": 1, "max_size": 4096}
+    assert cache.stats() == stats
+
+    code = compile("def other(): pass", "<test>", "exec").co_consts[0]
+    cache.fetch(code, lambda: "tree")
+    assert len(cache) == 2
+    del code
+    gc.collect()
+    assert len(cache) == 1
+
+def test_cache_lru():
+    cache = ASTCache(max_size=2)
+    def fun1(): pass
+    def fun2(): pass
+    def fun3(): pass
+    cache.fetch(fun1.__code__, lambda: 1)
+    cache.fetch(fun2.__code__, lambda: 2)
+    cache.fetch(fun1.__code__, lambda: 1)
+    cache.fetch(fun3.__code__, lambda: 3)
+    assert fun1.__code__ in cache
+    assert fun2.__code__ not in cache
+    assert fun3.__code__ in cache
+
+def test_cache_disk(tmpdir):
+    def fun1():
+        return ""
+
+    def fun():
+        a = fun1()
+        a.strip()
+
+    ast_cache.use_disk_cache(str(tmpdir))
+    try:
+        builder = CallGraphBuilder()
+        builder.build(fun)
+        assert ast_cache.disk.misses == 2
+        ast_cache.clear()
+        ast_cache.use_disk_cache(str(tmpdir))
+        root = builder.build(fun)
+        assert ast_cache.disk.hits == 2
+        assert ast_cache.disk.misses == 0
+    finally: ast_cache.use_disk_cache(None)
+
+    path = ["fun", "fun.fun1", "fun.strip"]
+    assert list(dfs_node_names(root)) == path
+
+def test_cache_disk_invalidation(tmpdir):
+    def make_code(source):
+        filename = str(tmpdir.join("module.py"))
+        with open(filename, "w") as module_file: module_file.write(source)
+        return compile(source, filename, "exec").co_consts[0]
+
+    cache = DiskCache(str(tmpdir.join("cache")))
+    code = make_code("def fun():\n    pass\n")
+    assert cache.fetch(code, lambda: "tree") == "tree"
+    assert cache.fetch(code, lambda: "other") == "tree"
+    stat = os.stat(code.co_filename)
+    mtime = stat.st_mtime_ns + 10**9
+    os.utime(code.co_filename, ns=(mtime, mtime))
+    assert cache.fetch(code, lambda: "other") == "tree"
+    code = make_code("def fun():\n    return None\n")
+    assert cache.fetch(code, lambda: "other") == "other"
+    assert (cache.hits, cache.misses) == (2, 2)
+
+def test_cache_disk_format_version(tmpdir, monkeypatch):
+    filename = str(tmpdir.join("module.py"))
+    with open(filename, "w") as module_file:
+        module_file.write("def fun():\n    pass\n")
+    code = compile(open(filename).read(), filename, "exec").co_consts[0]
+
+    cache = DiskCache(str(tmpdir.join("cache")))
+    assert cache.fetch(code, lambda: "tree") == "tree"
+    monkeypatch.setattr(DiskCache, "format_version", 0)
+    assert cache.fetch(code, lambda: "new tree") == "new tree"
+    path = cache.entry_path(code)
+    monkeypatch.undo()
+    # the old entries at the new path are rejected too
+    os.replace(path, cache.entry_path(code))
+    assert cache.fetch(code, lambda: "newer tree") == "newer tree"
+    assert (cache.hits, cache.misses) == (0, 3)
+
+def test_cache_disk_eviction(tmpdir):
+    cache = DiskCache(str(tmpdir), max_bytes=1024)
+    codes = [compile("def fun{0}(): pass".format(i), __file__, "exec")\
+             .co_consts[0] for i in range(8)]
+    for code in codes:
+        cache.fetch(code, lambda: 100 * "x")
+    assert 0 < len(tmpdir.listdir()) < len(codes)
+    assert sum(x.size() for x in tmpdir.listdir()) <= 1024
+
+def test_cache_module_parsed_once():
+    def fun1():
+        pass
+
+    def fun2():
+        fun1()
+
+    def fun():
+        fun1()
+        fun2()
+
+    module_cache.clear()
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+
+    path = ["fun", "fun.fun1", "fun.fun2", "fun.fun2.fun1"]
+    assert list(dfs_node_names(root)) == path
+    assert module_cache.stats()["misses"] == 1
+
+def test_cache_module_line_numbers():
+    def decor(fun):
+        return fun
+
+    @decor
+    def fun():
+        return ""
+
+    code = make_code(fun)
+    assert code.ast.name == "fun"
+    assert code.source_line(code.lineno).strip() == "@decor"
+    assert code.source_line(code.lineno + 1).strip() == "def fun():"
+    assert code.ast.body[0].lineno == code.lineno + 2
+    assert code.source.startswith("@decor\ndef fun():\n")
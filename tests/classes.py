@@ -7,10 +7,12 @@
 # AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
 #
 
-import pytest, re
+import pytest, re, gc
 from functools import wraps
+from weakref import ref
 
 from callgraph.builder import CallGraphBuilder
+from callgraph.utils import static_attr, class_attrs_cache
 from tests.helpers import dfs_node_names
 
 def test_classes_in_class_call():
@@ -321,3 +323,195 @@ def test_classes_assigment_into_instance_after_instatiation():
     path = ["fun", "fun.A", "fun.strip", "fun.to_bytes"]
     assert list(dfs_node_names(root)) == path
 
+
+def test_classes_local():
+    def fun():
+        class A(object):
+            def __init__(self):
+                "".strip()
+            def method(self):
+                "".lower()
+            class B(object):
+                def method(self):
+                    pass
+        def helper():
+            return A()
+        helper().method()
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.helper", "fun.helper.A", "fun.helper.A.strip",
+            "fun.method", "fun.method.lower"]
+    assert list(dfs_node_names(root)) == path
+
+def test_classes_local_two_parents():
+    def factory(callback):
+        def fun():
+            class A(object):
+                def method(self):
+                    callback()
+            A().method()
+        return fun
+
+    def h1():
+        pass
+
+    def h2():
+        pass
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(factory(h1))
+    root2 = builder.build(factory(h2))
+
+    path = ["fun", "fun.object", "fun.method", "fun.method.h1"]
+    assert list(dfs_node_names(root1)) == path
+    path = ["fun", "fun.object", "fun.method", "fun.method.h2"]
+    assert list(dfs_node_names(root2)) == path
+
+def test_classes_static_attributes():
+    calls = []
+    class A(object):
+        def __init__(self):
+            pass
+        @property
+        def prop(self):
+            calls.append("prop")
+            return ""
+        @staticmethod
+        def static():
+            "".strip()
+        def __getattr__(self, name):
+            calls.append(name)
+            return ""
+
+    a = A()
+    def fun():
+        a.prop
+        a.static()
+        a.missing.lower()
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.static", "fun.static.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert calls == []
+
+def test_classes_static_attributes_builds():
+    class A(object):
+        def __init__(self):
+            pass
+        @staticmethod
+        def static():
+            return ""
+
+    def h1():
+        pass
+
+    def fun1():
+        a = A()
+        a.handler = h1
+        a.handler()
+        A.static().cb = h1
+        A.cls_handler = h1
+
+    def fun2():
+        b = A()
+        b.handler()
+        A.static().cb()
+        A.cls_handler()
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(fun1)
+    root2 = builder.build(fun2)
+
+    path = ["fun1", "fun1.A", "fun1.h1", "fun1.static"]
+    assert list(dfs_node_names(root1)) == path
+    path = ["fun2", "fun2.A", "fun2.static"]
+    assert list(dfs_node_names(root2)) == path
+    assert not hasattr(A, "handler") and not hasattr(A, "cls_handler")
+
+def test_classes_static_attributes_cache():
+    class A(object):
+        @classmethod
+        def create(cls):
+            return cls
+
+    class B(A):
+        def method(self):
+            return super().method()
+
+    assert static_attr(A, "create")[1].__self__ is A
+    assert static_attr(B(), "method")[1].__self__.__class__ is B
+    assert static_attr(B, "create")[1].__self__ is B
+    assert static_attr(B(), "create")[1].__self__ is B
+    classes = [ref(A), ref(B)]
+    assert all(x() in class_attrs_cache for x in classes)
+    del A, B
+    gc.collect()
+    assert [x() for x in classes] == [None, None]
+
+def test_classes_super_from_base_method():
+    class A(object):
+        def __init__(self):
+            pass
+
+        def method(self):
+            "".strip()
+
+    class B(A):
+        def method(self):
+            super().method()
+
+    class C(B):
+        pass
+
+    def fun():
+        c = C()
+        c.method()
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.A", "fun.method", "fun.method.__super__",
+            "fun.method.method", "fun.method.method.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.classes.super_classes(C, B.method) == (A,)
+
+def test_classes_overrides():
+    class A(object):
+        def __init__(self):
+            pass
+
+        def method(self):
+            "".strip()
+
+    class B(A):
+        def method(self):
+            "".lower()
+
+    class C(B):
+        pass
+
+    def fun():
+        a = A()
+        a.method()
+
+    builder = CallGraphBuilder(overrides=True)
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.A", "fun.method", "fun.method.strip", "fun.method",
+            "fun.method.lower"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.classes.subclasses(A) == [B, C]
+    assert builder.classes.implementations(A, "method") == [A.method,
+                                                            B.method]
@@ -65,3 +65,86 @@ def test_consts_ellipsis():
     assert list(dfs_node_names(root)) == path
 
 
+
+def test_consts_interned():
+    def fun():
+        a = "a"
+        b = "a"
+        len(a)
+        len(b)
+        a.strip()
+        b.strip()
+        c = 1
+        d = True
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+
+    path = ["fun", "fun.len", "fun.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert root.symbol.get("a") is root.symbol.get("b")
+    assert root.symbol.get("c") is not root.symbol.get("d")
+    len_symbol = root.children[0].symbol
+    assert builder.builtins[len] is len_symbol
+
+def test_consts_builtin_results_apart():
+    def h1():
+        pass
+
+    def fun():
+        a = sorted([])
+        a.cb = h1
+        a.cb()
+        b = sorted([])
+        b.cb()
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+
+    path = ["fun", "fun.sorted", "fun.h1"]
+    assert list(dfs_node_names(root)) == path
+    assert [x.invalid for x in root.children] == [False, False, True]
+
+def test_consts_interned_builds():
+    def h1():
+        pass
+
+    def fun1():
+        a = sorted([])
+        a.cb = h1
+        a.cb()
+        "".strip().cb = h1
+
+    def fun2():
+        sorted([]).cb()
+        "".strip().lower()
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(fun1)
+    root2 = builder.build(fun2)
+    other = CallGraphBuilder()
+    root3 = other.build(fun2)
+
+    assert list(dfs_node_names(root1)) == ["fun1", "fun1.sorted", "fun1.h1",
+                                           "fun1.strip"]
+    path = ["fun2", "fun2.sorted", "fun2.strip", "fun2.lower"]
+    assert list(dfs_node_names(root2)) == path
+    assert list(dfs_node_names(root3)) == path
+    assert builder.builtins[sorted] is not other.builtins[sorted]
+
+def test_consts_builtin_results():
+    def fun():
+        a = repr(fun).strip().lower()
+        a.split()
+        "".strip().upper().count("a").bit_length()
+        len(a).to_bytes()
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.repr", "fun.strip", "fun.lower", "fun.split",
+            "fun.strip", "fun.upper", "fun.count", "fun.bit_length",
+            "fun.len", "fun.to_bytes"]
+    assert list(dfs_node_names(root)) == path
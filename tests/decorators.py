@@ -278,3 +278,25 @@ def test_decorators_class():
             "fun.method"]
     assert list(dfs_node_names(root)) == path
 
+
+def test_decorators_nested_helpers():
+    def decorator(function):
+        def wrapper():
+            def call():
+                function()
+            call()
+        return wrapper
+
+    def a():
+        pass
+
+    def b():
+        pass
+
+    root_a = CallGraphBuilder().build(decorator(a))
+    root_b = CallGraphBuilder().build(decorator(b))
+
+    path = ["wrapper", "wrapper.call", "wrapper.call.a"]
+    assert list(dfs_node_names(root_a)) == path
+    path = ["wrapper", "wrapper.call", "wrapper.call.b"]
+    assert list(dfs_node_names(root_b)) == path
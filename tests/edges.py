@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for streamed callgraph edges.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+from itertools import islice
+
+from callgraph.builder import CallGraphBuilder
+from tests.helpers import dfs_node_names
+
+def edge_name(edge):
+    caller = edge.caller.name if edge.caller else None
+    return caller, edge.callee.name, edge.recursive
+
+def test_edges_stream():
+    def fun1():
+        return ""
+
+    def fun():
+        a = fun1()
+        a.strip()
+
+    builder = CallGraphBuilder()
+    edges = list(builder.iter_edges(fun))
+
+    names = [(None, "fun", False), ("fun", "fun1", False),
+             ("fun", "strip", False)]
+    assert list(map(edge_name, edges)) == names
+    assert edges[0].called_at is None
+    assert edges[1].called_at[1] == fun.__code__.co_firstlineno + 1
+    assert not edges[0].callee.children
+
+def test_edges_recursion():
+    def fun(a):
+        if a: fun(a - 1)
+
+    builder = CallGraphBuilder()
+    names = [(None, "fun", False), ("fun", "fun", True)]
+    assert list(map(edge_name, builder.iter_edges(fun))) == names
+
+def test_edges_stop_early():
+    def fun1():
+        "".strip()
+
+    def fun():
+        fun1()
+        fun1()
+
+    builder = CallGraphBuilder()
+    edges = list(islice(builder.iter_edges(fun), 2))
+    assert list(map(edge_name, edges)) == [(None, "fun", False),
+                                           ("fun", "fun1", False)]
+
+    root = builder.build(fun)
+    assert list(dfs_node_names(root)) == ["fun", "fun.fun1",
+                                          "fun.fun1.strip"]
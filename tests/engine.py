@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for build engines.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import pytest, sys
+
+from callgraph.builder import CallGraphBuilder
+from tests.helpers import dfs_node_names
+
+def test_engine_deep_chain(tmpdir):
+    depth = sys.getrecursionlimit()
+    source = "".join("def f{0}():\n    f{1}()\n".format(i, i + 1)
+                     for i in range(depth))
+    source += "def f{0}():\n    pass\n".format(depth)
+    filename = str(tmpdir.join("deep_chain.py"))
+    with open(filename, "w") as module_file: module_file.write(source)
+    namespace = {}
+    exec(compile(source, filename, "exec"), namespace)
+
+    builder = CallGraphBuilder(silent=True)
+    node = builder.build(namespace["f0"])
+    for i in range(depth + 1):
+        assert node.name == "f{0}".format(i)
+        node = next(iter(node.children), None)
+    assert node is None
+
+@pytest.mark.parametrize("order", ["dfs", "bfs", "priority"])
+def test_engine_orders(order):
+    def fun3():
+        pass
+
+    def fun1():
+        fun3()
+
+    def fun2():
+        pass
+
+    def fun():
+        fun1()
+        fun2()
+
+    builder = CallGraphBuilder(order=order)
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.fun3", "fun.fun2"]
+    assert list(dfs_node_names(root)) == path
+
+@pytest.mark.parametrize("order", ["dfs", "bfs"])
+def test_engine_recursion(order):
+    def fun2(a):
+        fun1(a)
+
+    def fun1(a):
+        if a: fun2(a - 1)
+        fun1(a)
+
+    def fun():
+        fun1(1)
+        fun2(1)
+
+    builder = CallGraphBuilder(order=order)
+    root = builder.build(fun)
+
+    path = ["fun", "fun.fun1", "fun.fun1.fun2", "fun.fun2", "fun.fun2.fun1"]
+    assert list(dfs_node_names(root)) == path
+    fun1_node = root.children[0]
+    assert fun1_node.recur_children == [fun1_node]
+    assert fun1_node.children[0].recur_children == [fun1_node]
+    assert len(set([fun1_node, root.children[1].children[0]])) == 1
+
+def test_engine_node_keys():
+    def fun():
+        list(map(lambda x: x, [1]))
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(fun)
+    keys = len(builder.node_keys)
+    root2 = builder.build(fun)
+
+    assert len(builder.node_keys) == keys
+    assert root1 == root2
+    assert root1.children[0] != root2
+
+def test_engine_priority():
+    def fun1():
+        pass
+
+    def fun2():
+        pass
+
+    def fun():
+        fun1()
+        fun2()
+
+    evaluated = []
+    def priority(frame):
+        evaluated.append(frame.node.name)
+        return -len(evaluated)
+
+    builder = CallGraphBuilder(order="priority", priority=priority)
+    root = builder.build(fun)
+
+    path = ["fun", "fun.fun1", "fun.fun2"]
+    assert list(dfs_node_names(root)) == path
+    assert evaluated == ["fun", "fun1", "fun2"]
+
+def test_engine_invalid_order():
+    with pytest.raises(ValueError):
+        CallGraphBuilder(order="random")
@@ -95,3 +95,81 @@ def test_functions_return_chain():
     path = ["fun", "fun.fun1", "fun.fun1.fun2", "fun.strip"]
     assert list(dfs_node_names(root)) == path
 
+
+def test_functions_closure():
+    def factory():
+        def fun1():
+            "".strip()
+        def fun():
+            fun1()
+            late()
+        return fun
+        def late():
+            pass
+
+    builder = CallGraphBuilder()
+    root = builder.build(factory())
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.strip"]
+    assert list(dfs_node_names(root)) == path
+
+def test_functions_closure_two_parents():
+    def factory(callback):
+        def fun():
+            callback().strip()
+        return fun
+
+    def h1():
+        return ""
+
+    def h2():
+        return ""
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(factory(h1))
+    root2 = builder.build(factory(h2))
+    root3 = CallGraphBuilder().build(factory(h2))
+
+    assert list(dfs_node_names(root1)) == ["fun", "fun.h1", "fun.strip"]
+    assert list(dfs_node_names(root2)) == ["fun", "fun.h2", "fun.strip"]
+    assert list(dfs_node_names(root3)) == ["fun", "fun.h2", "fun.strip"]
+
+def test_functions_shadowed_builtin_builds():
+    def fun1():
+        def len(text):
+            text.strip()
+        len("a").cb = fun1
+
+    def fun2():
+        len("a").bit_length()
+        len("a").cb()
+
+    builder = CallGraphBuilder()
+    root1 = builder.build(fun1)
+    root2 = builder.build(fun2)
+    root3 = builder.build(fun1)
+
+    path = ["fun1", "fun1.len", "fun1.len.strip"]
+    assert list(dfs_node_names(root1)) == path
+    assert list(dfs_node_names(root3)) == path
+    path = ["fun2", "fun2.len", "fun2.bit_length"]
+    assert list(dfs_node_names(root2)) == path
+
+def test_functions_shadowed_builtin():
+    def fun():
+        def len(text):
+            text.strip()
+        len("a")
+        str("a")
+
+    builder = CallGraphBuilder()
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.len", "fun.len.strip", "fun.object"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.names.resolve(fun)["str"] is str
+    assert "len" not in builder.names.resolve(fun)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for callgraph with one vertex per function.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import pytest, pickle
+
+from callgraph.builder import CallGraphBuilder
+from tests.helpers import dfs_vertex_names, edge_names, depth_first_traverse
+from tests.helpers import node_name
+
+def test_graph_shared_function():
+    def fun1():
+        "".strip()
+
+    def fun2():
+        fun1()
+
+    def fun():
+        fun1()
+        fun2()
+        fun1()
+
+    builder = CallGraphBuilder()
+    graph = builder.build_graph(fun)
+
+    assert list(dfs_vertex_names(graph)) == ["fun", "fun1", "strip", "fun2"]
+    edges = ["fun.fun1", "fun1.strip", "fun.fun2", "fun2.fun1", "fun.fun1"]
+    assert list(edge_names(graph)) == edges
+    fun1 = next(x for x in graph if x.name == "fun1")
+    assert len(fun1.called_at) == 3
+    assert len(set(fun1.called_at)) == 3
+
+def test_graph_recursion():
+    def recur():
+        recur()
+
+    builder = CallGraphBuilder()
+    graph = builder.build_graph(recur)
+
+    assert list(dfs_vertex_names(graph)) == ["recur"]
+    assert list(edge_names(graph)) == ["recur.recur"]
+
+def test_graph_shared_returns():
+    def fun1():
+        return ""
+
+    def fun2():
+        a = fun1()
+        a.find()
+
+    def fun():
+        a = fun1()
+        a.strip()
+        fun2()
+
+    builder = CallGraphBuilder()
+    graph = builder.build_graph(fun)
+
+    assert list(dfs_vertex_names(graph)) == ["fun", "fun1", "strip", "fun2",
+                                             "find"]
+    edges = ["fun.fun1", "fun.strip", "fun.fun2", "fun2.fun1", "fun2.find"]
+    assert list(edge_names(graph)) == edges
+
+def test_graph_argument_callees():
+    def a():
+        pass
+
+    def b():
+        "".strip()
+
+    def call(cb):
+        cb()
+
+    def fun():
+        call(a)
+        call(b)
+        call(a)
+
+    root = CallGraphBuilder().build(fun)
+    graph = CallGraphBuilder().build_graph(fun)
+
+    tree_edges = set((node_name(x.parent), node_name(x))
+                     for x in depth_first_traverse(root) if x.parent)
+    graph_edges = set(tuple(x.split(".")) for x in edge_names(graph))
+    assert tree_edges <= graph_edges
+    edges = ["fun.call", "call.a", "fun.call", "call.b", "b.strip", "fun.call"]
+    assert list(edge_names(graph)) == edges
+
+def test_graph_pickle():
+    def fun1():
+        pass
+
+    def fun():
+        fun1()
+
+    builder = CallGraphBuilder()
+    graph = pickle.loads(pickle.dumps(builder.build_graph(fun)))
+    assert list(dfs_vertex_names(graph)) == ["fun", "fun1"]
+    assert builder.graph is None
+
+def test_graph_graphviz():
+    pytest.importorskip("graphviz")
+    from callgraph.output import make_graphviz_tree
+
+    def fun1():
+        pass
+
+    def fun():
+        fun1()
+        fun1()
+
+    builder = CallGraphBuilder()
+    dot = make_graphviz_tree(builder.build_graph(fun))
+    assert dot.source.count("->") == 2
@@ -23,3 +23,32 @@ def dfs_node_names(root):
         path = [node_name(x) for x in node.path_to_root()]
         if path: yield ".".join(reversed(path))
 
+
+def depth_first_vertices(vertex, visited=None):
+    visited = set() if visited is None else visited
+    visited.add(vertex)
+    yield vertex
+    for child in vertex.children:
+        if child.invalid or child in visited: continue
+        yield from depth_first_vertices(child, visited)
+
+def dfs_vertex_names(graph):
+    for vertex in depth_first_vertices(graph.root):
+        yield node_name(vertex)
+
+def edge_names(graph):
+    for edge in graph.edges:
+        if edge.callee.invalid: continue
+        yield node_name(edge.caller) + "." + node_name(edge.callee)
+
+def compact_node_names(tree):
+    path, skip_depth = [], None
+    for node in tree:
+        if skip_depth is not None and node.depth > skip_depth: continue
+        skip_depth = None
+        if node.invalid and node.depth:
+            skip_depth = node.depth
+            continue
+        del path[node.depth:]
+        path.append(node_name(node))
+        yield ".".join(path)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for incremental rebuilds.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import os, sys, importlib, pytest
+
+from callgraph.builder import CallGraphBuilder
+from callgraph.incremental import watch
+from tests.helpers import dfs_node_names
+
+def write_module(tmpdir, name, source, mtime):
+    filename = str(tmpdir.join(name + ".py"))
+    with open(filename, "w") as module_file: module_file.write(source)
+    os.utime(filename, ns=(mtime, mtime))
+    return filename
+
+@pytest.mark.parametrize("precision", ["type", "code"])
+def test_incremental_rebuild(tmpdir, monkeypatch, precision):
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    write_module(tmpdir, "incr_leaf", "def leaf():\n    ''.strip()\n", 10**9)
+    write_module(tmpdir, "incr_other", "def other():\n    ''.find()\n", 10**9)
+    write_module(tmpdir, "incr_root",
+                 "from incr_leaf import leaf\n"
+                 "from incr_other import other\n"
+                 "def root():\n    leaf()\n    other()\n", 10**9)
+    for name in ("incr_leaf", "incr_other", "incr_root"):
+        sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    import incr_root
+
+    builder = CallGraphBuilder(silent=True, summary_precision=precision)
+    graphs = watch(builder, incr_root.root, interval=0)
+    root = next(graphs)
+    path = ["root", "root.leaf", "root.leaf.strip", "root.other",
+            "root.other.find"]
+    assert list(dfs_node_names(root)) == path
+    assert len(builder.summaries) == 3
+
+    # the callers of changed function are affected too
+    leaf = os.path.join(str(tmpdir), "incr_leaf.py")
+    write_module(tmpdir, "incr_leaf", "def leaf():\n    ''.lower()\n", 2*10**9)
+    affected = builder.dependencies.affected([leaf])
+    assert [x.rsplit(":", 1)[1] for x in affected] == ["1", "3"]
+
+    root = next(graphs)
+    path = ["root", "root.leaf", "root.leaf.lower", "root.other",
+            "root.other.find"]
+    assert list(dfs_node_names(root)) == path
+    # only the leaf and root are evaluated again, other is replayed
+    assert builder.summaries.stats()["hits"] == 1
+    assert builder.summaries.stats()["misses"] == 3 + 2
+    graphs.close()
+    for name in ("incr_leaf", "incr_other", "incr_root"):
+        sys.modules.pop(name, None)
+
+@pytest.mark.parametrize("precision", ["type", "code"])
+def test_incremental_registry(tmpdir, monkeypatch, precision):
+    monkeypatch.syspath_prepend(str(tmpdir))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    names = ("incr_reg_leaf", "incr_reg_setup", "incr_reg_root")
+    write_module(tmpdir, "incr_reg_leaf", "def leaf():\n    ''.strip()\n",
+                 10**9)
+    write_module(tmpdir, "incr_reg_setup",
+                 "from incr_reg_leaf import leaf\n"
+                 "def setup(registry):\n    registry.handler = leaf\n",
+                 10**9)
+    write_module(tmpdir, "incr_reg_root",
+                 "from incr_reg_setup import setup\n"
+                 "class Registry(object):\n"
+                 "    def __init__(self):\n        pass\n"
+                 "def root():\n    registry = Registry()\n"
+                 "    setup(registry)\n    registry.handler()\n", 10**9)
+    for name in names: sys.modules.pop(name, None)
+    importlib.invalidate_caches()
+    import incr_reg_root
+
+    builder = CallGraphBuilder(silent=True, summary_precision=precision)
+    graphs = watch(builder, incr_reg_root.root, interval=0)
+    root = next(graphs)
+    path = ["root", "root.Registry", "root.setup", "root.leaf",
+            "root.leaf.strip"]
+    assert list(dfs_node_names(root)) == path
+
+    # the summary of setup stores the function of changed file
+    write_module(tmpdir, "incr_reg_leaf", "def leaf():\n    ''.lower()\n",
+                 2*10**9)
+    root = next(graphs)
+    path = ["root", "root.Registry", "root.setup", "root.leaf",
+            "root.leaf.lower"]
+    assert list(dfs_node_names(root)) == path
+    # the summaries of old code of reloaded modules are dropped
+    modules = [sys.modules[name] for name in names]
+    codes = [modules[0].leaf.__code__, modules[1].setup.__code__,
+             modules[2].root.__code__, modules[2].Registry.__init__.__code__]
+    # the code objects of equal source are equal, their ids are not
+    assert set(id(key if precision == "code" else key[0])
+               for key in builder.summaries.summaries) <= set(map(id, codes))
+    graphs.close()
+    for name in names: sys.modules.pop(name, None)
+
+@pytest.mark.parametrize("precision", [None, "identity"])
+def test_incremental_needs_precision(precision):
+    def fun():
+        "".strip()
+
+    builder = CallGraphBuilder(silent=True, summary_precision=precision)
+    with pytest.raises(ValueError):
+        next(watch(builder, fun))
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# LICENCE       MIT
+#
+# DESCRIPTION   Test suite for function summaries.
+#
+# AUTHOR        Michal Bukovsky <michal.bukovsky@trilogic.cz>
+#
+
+import pytest
+
+from callgraph.builder import CallGraphBuilder
+from tests.helpers import dfs_node_names
+
+def test_summaries_replay_callees():
+    def fun1():
+        "".strip()
+
+    def fun2():
+        fun1()
+
+    def fun():
+        fun1()
+        fun2()
+
+    builder = CallGraphBuilder(summary_precision="identity")
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.fun1.strip", "fun.fun2", "fun.fun2.fun1",
+            "fun.fun2.fun1.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.summaries.hits == 1
+
+def test_summaries_replay_returns():
+    def fun1():
+        return ""
+
+    def fun():
+        a = fun1()
+        a.strip()
+        b = fun1()
+        b.find()
+
+    builder = CallGraphBuilder(summary_precision="code")
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.fun1", "fun.strip", "fun.find"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.summaries.hits == 1
+
+def test_summaries_precision():
+    def fun1(a):
+        a.strip()
+
+    def fun():
+        fun1("a")
+        fun1("b")
+
+    builder = CallGraphBuilder(summary_precision="identity")
+    builder.build(fun)
+    assert builder.summaries.stats()["hits"] == 0
+
+    builder = CallGraphBuilder(summary_precision="type")
+    root = builder.build(fun)
+    assert builder.summaries.stats()["hits"] == 1
+
+    path = ["fun", "fun.fun1", "fun.fun1.strip"]
+    assert list(dfs_node_names(root)) == path
+
+@pytest.mark.parametrize("precision", [None, "identity", "type"])
+def test_summaries_instances(precision):
+    class Runner(object):
+        def __init__(self, cb):
+            self.cb = cb
+
+    def h1():
+        pass
+
+    def h2():
+        pass
+
+    def call_cb(runner):
+        runner.cb()
+
+    def fun():
+        call_cb(Runner(h1))
+        call_cb(Runner(h2))
+
+    builder = CallGraphBuilder(summary_precision=precision)
+    root = builder.build(fun)
+
+    path = ["fun", "fun.Runner", "fun.call_cb", "fun.call_cb.h1",
+            "fun.call_cb.h2"]
+    assert list(dfs_node_names(root)) == path
+
+def test_summaries_replay_stores():
+    class A(object):
+        def __init__(self):
+            self.a = "str"
+
+    def fun():
+        a = A()
+        b = A()
+        b.a.strip()
+
+    builder = CallGraphBuilder(summary_precision="type")
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.A", "fun.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.summaries.hits == 1
+
+def test_summaries_replay_stores_into_instances():
+    class A(object):
+        def __init__(self):
+            pass
+
+    def h():
+        return ""
+
+    def setup(a):
+        a.handler = h
+
+    def fun():
+        a = A()
+        setup(a)
+        a.handler()
+        b = A()
+        setup(b)
+        b.handler().strip()
+
+    builder = CallGraphBuilder(summary_precision="type")
+    root = builder.build(fun)
+
+    path = ["fun", "fun.A", "fun.setup", "fun.h", "fun.strip"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.summaries.hits == 3
+
+def test_summaries_replay_stores_into_constant():
+    class A(object):
+        pass
+
+    def store(a):
+        a.x = ""
+
+    def fun():
+        store(A)
+        store("lit")
+
+    builder = CallGraphBuilder(summary_precision="code")
+    root = builder.build(fun)
+    from callgraph.indent_printer import dump_tree
+    dump_tree(root, lambda x: x.children)
+
+    path = ["fun", "fun.store"]
+    assert list(dfs_node_names(root)) == path
+    assert builder.summaries.hits == 1
+
+def test_summaries_limit():
+    def fun1():
+        pass
+
+    def fun2():
+        pass
+
+    def fun():
+        fun1()
+        fun2()
+        fun1()
+
+    builder = CallGraphBuilder(summary_precision="code", summary_limit=1)
+    root = builder.build(fun)
+
+    path = ["fun", "fun.fun1", "fun.fun2"]
+    assert list(dfs_node_names(root)) == path
+    assert len(builder.summaries) == 1
+    assert builder.summaries.hits == 0
+
+def test_summaries_invalid_precision():
+    with pytest.raises(ValueError):
+        CallGraphBuilder(summary_precision="exact")